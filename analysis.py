@@ -0,0 +1,191 @@
+#analysis.py
+
+import argparse
+import json
+import os
+import struct
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from board import HexBoard
+from player import AI_Player
+from transposition import TranspositionTable
+
+# Formato binario compacto: cabecera y, por posición, (tamaño, jugador al turno) y las casillas
+# empaquetadas a 2 bits (4 por byte, en orden fila * N + columna)
+MAGIC = b"HEXP"
+VERSION = 1
+HEADER = struct.Struct("<4sH")
+RECORD = struct.Struct("<BB")
+
+# Posiciones enviadas al pool sin resultado recogido, por proceso (limita la memoria del flujo)
+EN_VUELO_POR_PROCESO = 4
+
+
+def _normalizar(pos: dict, index: int) -> dict:
+    """
+    Posición de entrada -> {"id", "size", "cells" (lista plana), "to_move"}.
+    Acepta "board" (matriz N x N) o "stones" ([fila, columna, jugador]); sin "to_move" mueve
+    el jugador 1 si ambos tienen las mismas fichas y si no el 2.
+    """
+    if "board" in pos:
+        size = len(pos["board"])
+        cells = [int(cell) for row in pos["board"] for cell in row]
+    else:
+        size = int(pos["size"])
+        cells = [0] * (size * size)
+        for row, col, player_id in pos.get("stones", []):
+            cells[row * size + col] = int(player_id)
+    to_move = pos.get("to_move")
+    if to_move is None:
+        to_move = 1 if cells.count(1) == cells.count(2) else 2
+    return {"id": pos.get("id", index), "size": size, "cells": cells, "to_move": int(to_move)}
+
+
+def leer_jsonl(f) -> iter:
+    """Posiciones de un fichero JSONL abierto, una por línea, sin cargarlo entero."""
+    for index, linea in enumerate(f):
+        if linea.strip():
+            yield _normalizar(json.loads(linea), index)
+
+
+def leer_binario(f) -> iter:
+    """Posiciones de un fichero binario abierto (ver escribir_binario)."""
+    magic, version = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("No es un fichero de posiciones compatible")
+    index = 0
+    while True:
+        cabecera = f.read(RECORD.size)
+        if not cabecera:
+            return
+        size, to_move = RECORD.unpack(cabecera)
+        datos = f.read((size * size + 3) // 4)
+        cells = [(datos[i // 4] >> (2 * (i % 4))) & 3 for i in range(size * size)]
+        yield {"id": index, "size": size, "cells": cells, "to_move": to_move}
+        index += 1
+
+
+def escribir_binario(f, posiciones) -> int:
+    """Escribe posiciones normalizadas en formato binario en un fichero abierto; devuelve cuántas."""
+    f.write(HEADER.pack(MAGIC, VERSION))
+    total = 0
+    for pos in posiciones:
+        size, cells = pos["size"], pos["cells"]
+        datos = bytearray((size * size + 3) // 4)
+        for i, cell in enumerate(cells):
+            datos[i // 4] |= cell << (2 * (i % 4))
+        f.write(RECORD.pack(size, pos["to_move"]))
+        f.write(datos)
+        total += 1
+    return total
+
+
+def leer(path: str) -> iter:
+    """Posiciones de `path` ('-' es la entrada estándar): binario si empieza por MAGIC, si no JSONL."""
+    if path == "-":
+        yield from leer_jsonl(sys.stdin)
+        return
+    with open(path, "rb") as f:
+        binario = f.read(len(MAGIC)) == MAGIC
+    if binario:
+        with open(path, "rb") as f:
+            yield from leer_binario(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from leer_jsonl(f)
+
+
+# Estado de cada proceso del pool: una tabla de transposición que se vacía en cada posición
+_TABLA = None
+
+
+def _init_worker(tt_mb: float):
+    global _TABLA
+    _TABLA = TranspositionTable(tt_mb)
+
+
+def analizar_posicion(pos: dict, time_limit: float = 1.0, max_nodes: int | None = None, max_depth: int = 100,
+                      opening_book: str | None = None) -> dict:
+    """
+    Busca la mejor jugada de la posición con un presupuesto de tiempo y/o nodos.
+    Devuelve {"id", "move", "score", "proven", "depth", "stats"}; "score" es el valor para quien mueve
+    (None si la jugada no salió de la búsqueda: libro o amenaza inmediata) y "proven" es "win" o "loss"
+    si la búsqueda demostró el resultado (entonces "score" es None: JSON no admite infinitos).
+    """
+    global _TABLA
+    size = pos["size"]
+    board = HexBoard(size)
+    for idx, cell in enumerate(pos["cells"]):
+        if cell:
+            board.place_piece(idx // size, idx % size, cell)
+    if _TABLA is None:
+        _TABLA = TranspositionTable()
+    _TABLA.clear()  # Resultados independientes del orden de las posiciones
+
+    player = AI_Player(pos["to_move"], max_depth=max_depth, time_limit=time_limit, tt_mb=0,
+                       opening_book=opening_book, max_nodes=max_nodes)
+    player.tt = _TABLA
+    player.first_move = False  # Siempre buscar (sin aperturas al azar)
+    move, stats = player.play_with_stats(board)
+    resumen = stats.as_dict()
+    return {"id": pos["id"], "move": list(move) if move != (-1, -1) else None, "score": resumen["score"],
+            "proven": resumen["proven"], "depth": stats.depth, "stats": resumen}
+
+
+def _analizar_args(args: tuple) -> dict:
+    return analizar_posicion(*args)
+
+
+def analizar(posiciones, workers: int | None = None, time_limit: float = 1.0, max_nodes: int | None = None,
+             max_depth: int = 100, opening_book: str | None = None, tt_mb: float = 16.0) -> iter:
+    """
+    Analiza un flujo de posiciones en `workers` procesos y produce los resultados en el orden de entrada
+    a medida que terminan. Solo hay unas pocas posiciones pendientes por proceso, así que el flujo
+    puede ser de cualquier longitud.
+    """
+    workers = workers or os.cpu_count() or 1
+    limite = EN_VUELO_POR_PROCESO * workers
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(tt_mb,)) as pool:
+        pendientes = deque()
+        for pos in posiciones:
+            pendientes.append(pool.submit(_analizar_args, (pos, time_limit, max_nodes, max_depth, opening_book)))
+            if len(pendientes) >= limite:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análisis por lotes de posiciones de Hex.")
+    parser.add_argument("input", help="Fichero JSONL o binario de posiciones ('-' para la entrada estándar)")
+    parser.add_argument("--out", default=None, help="Fichero JSONL de resultados (por defecto, la salida estándar)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--time", type=float, default=None, help="Segundos por posición (por defecto 1, sin límite con --nodes)")
+    parser.add_argument("--nodes", type=int, default=None, help="Nodos por posición (resultados reproducibles)")
+    parser.add_argument("--depth", type=int, default=100, help="Profundidad máxima")
+    parser.add_argument("--book", default=None, help="Libro de aperturas (fichero o directorio)")
+    parser.add_argument("--tt-mb", type=float, default=16.0, help="Tabla de transposición por proceso")
+    parser.add_argument("--to-binary", default=None, help="Solo convertir la entrada a formato binario en este fichero")
+    args = parser.parse_args()
+
+    if args.to_binary:
+        with open(args.to_binary, "wb") as f:
+            total = escribir_binario(f, leer(args.input))
+        print(f"{total} posiciones escritas en {args.to_binary}", file=sys.stderr)
+        return
+
+    time_limit = args.time if args.time is not None else float("inf") if args.nodes else 1.0
+    salida = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for resultado in analizar(leer(args.input), args.workers, time_limit, args.nodes, args.depth,
+                                  args.book, args.tt_mb):
+            salida.write(json.dumps(resultado, allow_nan=False) + "\n")
+            salida.flush()
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#batch_playout.py
+
+import argparse
+import time
+import numpy as np
+from board import HexBoard
+import heuristics as h
+
+
+def rellenar(boards: np.ndarray, to_move: np.ndarray | int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Completa al azar un lote de tableros (B, N, N) alternando jugadores desde `to_move`
+    (un jugador por tablero o uno común). Devuelve un nuevo lote sin casillas vacías.
+    """
+    lote, size, _ = boards.shape
+    flat = boards.reshape(lote, size * size)
+    vacias = flat == 0
+    # Orden aleatorio de las casillas vacías: claves al azar, las ocupadas al final
+    claves = rng.random(flat.shape)
+    claves[~vacias] = 2.0
+    orden = np.argsort(claves, axis=1)
+    turno = np.empty(flat.shape, dtype=np.int64)
+    np.put_along_axis(turno, orden, np.arange(size * size)[np.newaxis, :], axis=1)
+    to_move = np.broadcast_to(np.asarray(to_move, dtype=flat.dtype), (lote,))[:, np.newaxis]
+    # La k-ésima vacía (k par) la ocupa el jugador al que le toca; las demás, su rival
+    jugada = np.where(turno % 2 == 0, to_move, 3 - to_move)
+    return np.where(vacias, jugada, flat).astype(boards.dtype).reshape(boards.shape)
+
+
+def _filas_de_bits(propias: np.ndarray) -> np.ndarray:
+    """(B, N, N) booleano -> (N, B) uint64: el bit c de la fila r de cada tablero es la casilla (r, c)."""
+    size = propias.shape[2]
+    pesos = np.left_shift(np.uint64(1), np.arange(size, dtype=np.uint64))
+    filas = (propias.astype(np.uint64) * pesos).sum(axis=2, dtype=np.uint64)
+    return np.ascontiguousarray(filas.T)
+
+
+def ganadores(boards: np.ndarray) -> np.ndarray:
+    """
+    Ganador de cada tablero lleno de un lote (B, N, N): siempre hay exactamente uno, así que basta con
+    propagar desde la columna izquierda las fichas del jugador 1; gana él si alcanza la derecha, si no el 2.
+    Cada fila de cada tablero es un entero de N bits y la propagación recorre las filas hacia abajo y
+    hacia arriba (cada paso sobre todo el lote a la vez) hasta que nada cambia.
+    """
+    size = boards.shape[1]
+    if size > 63:
+        raise ValueError("ganadores admite tableros de hasta 63x63")
+    propias = _filas_de_bits(boards == 1)
+    uno = np.uint64(1)
+
+    # Relleno dentro de la fila en pasos de 1, 2, 4... casillas (Kogge-Stone) hacia cada lado
+    saltos, hacia_der, hacia_izq = [], [], []
+    der = izq = propias
+    salto = 1
+    while salto < size:
+        saltos.append(np.uint64(salto))
+        hacia_der.append(der)
+        hacia_izq.append(izq)
+        der = der & (der << np.uint64(salto))
+        izq = izq & (izq >> np.uint64(salto))
+        salto *= 2
+
+    alcanzadas = propias & uno  # Fichas en la columna izquierda
+    orden = list(range(size)) + list(range(size - 2, 0, -1))
+    while True:
+        antes = alcanzadas.copy()
+        for r in orden:
+            x = alcanzadas[r]
+            if r > 0:      # Vecinos (-1, 0) y (-1, 1)
+                x = x | ((alcanzadas[r - 1] | (alcanzadas[r - 1] >> uno)) & propias[r])
+            if r < size - 1:  # Vecinos (1, 0) y (1, -1)
+                x = x | ((alcanzadas[r + 1] | (alcanzadas[r + 1] << uno)) & propias[r])
+            for k, salto in enumerate(saltos):  # Vecinos (0, -1) y (0, 1), a lo largo de la fila
+                x |= (x << salto) & hacia_der[k][r]
+            for k, salto in enumerate(saltos):
+                x |= (x >> salto) & hacia_izq[k][r]
+            alcanzadas[r] = x
+        if np.array_equal(alcanzadas, antes):
+            break
+    derecha = uno << np.uint64(size - 1)
+    return np.where((alcanzadas & derecha).any(axis=0), 1, 2)
+
+
+def simular(board: np.ndarray, to_move: int, playouts: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """
+    `playouts` partidas aleatorias desde un tablero (N, N). Devuelve (tableros llenos (B, N, N), ganadores (B,)).
+    """
+    lote = np.broadcast_to(np.asarray(board, dtype=np.int8), (playouts,) + np.shape(board))
+    llenos = rellenar(lote, to_move, rng)
+    return llenos, ganadores(llenos)
+
+
+def tasa_victorias(board: HexBoard, player_id: int, to_move: int, playouts: int = 1000,
+                   rng: np.random.Generator | None = None) -> float:
+    """Fracción de partidas aleatorias desde `board` que gana `player_id` si mueve `to_move`."""
+    rng = rng if rng is not None else np.random.default_rng()
+    _, winners = simular(np.array(board.board), to_move, playouts, rng)
+    return float(np.mean(winners == player_id))
+
+
+def calibrar(size: int, positions: int = 200, playouts: int = 1000, seed: int = 0) -> tuple[list, float]:
+    """
+    Calibración de evaluate_board: posiciones aleatorias (con N a 3N fichas) puntuadas por la heurística
+    del jugador 1 y por su tasa de victorias en partidas aleatorias con el jugador 1 al turno.
+    Devuelve ([(evaluación, tasa)], correlación de Pearson).
+    """
+    rng = np.random.default_rng(seed)
+    pares = []
+    while len(pares) < positions:
+        board = HexBoard(size)
+        fichas = int(rng.integers(size, 3 * size + 1)) // 2 * 2  # Pares: le toca al jugador 1
+        for k, idx in enumerate(rng.permutation(size * size)[:fichas]):
+            board.place_piece(int(idx) // size, int(idx) % size, 1 + k % 2)
+        if board.check_connection(1) or board.check_connection(2):
+            continue
+        valor = h.evaluate_board(1, 2, board, h.obtener_disjointsets(board, 1))
+        pares.append((float(valor), tasa_victorias(board, 1, 1, playouts, rng)))
+    valores = np.array(pares)
+    correlacion = float(np.corrcoef(valores[:, 0], valores[:, 1])[0, 1])
+    return pares, correlacion
+
+
+def medir(size: int, lote: int = 4096, rondas: int = 5, seed: int = 0) -> float:
+    """Partidas aleatorias por segundo desde el tablero vacío, en lotes de `lote`."""
+    rng = np.random.default_rng(seed)
+    vacio = np.zeros((size, size), dtype=np.int8)
+    start = time.perf_counter()
+    for _ in range(rondas):
+        simular(vacio, 1, lote, rng)
+    return lote * rondas / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partidas aleatorias vectorizadas: velocidad y calibración.")
+    parser.add_argument("--size", type=int, default=11, help="Tamaño del tablero")
+    parser.add_argument("--batch", type=int, default=4096, help="Partidas por lote")
+    parser.add_argument("--calibrate", type=int, default=0, help="Posiciones para calibrar evaluate_board (0: solo velocidad)")
+    parser.add_argument("--playouts", type=int, default=1000, help="Partidas por posición al calibrar")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.size}x{args.size}: {medir(args.size, args.batch, seed=args.seed):.0f} partidas/s")
+    if args.calibrate:
+        _, correlacion = calibrar(args.size, args.calibrate, args.playouts, args.seed)
+        print(f"Correlación evaluate_board / tasa de victorias: {correlacion:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#benchmarks/hot_paths.py
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+# Raíz del repositorio: los módulos del motor se importan desde ahí
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from board import HexBoard
+from player import AI_Player
+import heuristics as h
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+SIZES = (7, 11, 15)
+# Fracción de casillas ocupadas de cada posición de prueba
+FILLS = {"empty": 0.0, "mid": 0.4, "full": 0.85}
+SEED = 20240501
+MINIMAX_DEPTH = 2
+REPEATS = 9           # Muestras por caso (se toma la mínima), una por pasada sobre todos los casos
+MIN_SAMPLE = 0.05     # Segundos mínimos de cada muestra (se repite la llamada hasta alcanzarlos)
+DEFAULT_THRESHOLD = 0.25
+# Un caso solo es regresión si empeora más que NOISE_FACTOR veces su ruido medido (si supera al umbral)
+NOISE_FACTOR = 3.0
+_DATOS_CALIBRACION = list(range(256))
+
+
+def posicion(size: int, fill: float, seed: int = SEED) -> HexBoard:
+    """Posición reproducible: fichas alternas en casillas al azar (la semilla depende del tamaño y el relleno)."""
+    rng = random.Random(f"{seed}-{size}-{fill}")
+    board = HexBoard(size)
+    cells = [(i, j) for i in range(size) for j in range(size)]
+    rng.shuffle(cells)
+    for k, (row, col) in enumerate(cells[:int(size * size * fill)]):
+        board.place_piece(row, col, 1 + k % 2)
+    return board
+
+
+def calibracion() -> list:
+    """
+    Trabajo fijo de Python puro (bucles, diccionarios, ordenación) sin relación con el motor. Cada muestra
+    de un caso se mide junto a una de calibración: la comparación con la referencia usa el cociente, así
+    que una máquina más lenta o más cargada que al guardarla no parece una regresión.
+    """
+    cuentas = {}
+    for i in _DATOS_CALIBRACION:
+        cuentas[i & 31] = cuentas.get(i & 31, 0) + i * i
+    return sorted(cuentas.values())
+
+
+def repeticiones(funcion) -> int:
+    """Llamadas por muestra: se duplican hasta que una muestra dure al menos MIN_SAMPLE segundos."""
+    funcion()  # Calentamiento (cachés por tamaño, asignaciones iniciales)
+    veces = 1
+    while muestra(funcion, veces) * veces < MIN_SAMPLE:
+        veces *= 2
+    return veces
+
+
+def muestra(funcion, veces: int) -> float:
+    """Segundos por llamada de `veces` llamadas seguidas."""
+    start = time.perf_counter()
+    for _ in range(veces):
+        funcion()
+    return (time.perf_counter() - start) / veces
+
+
+def _minimax(board: HexBoard):
+    """Búsqueda a profundidad fija MINIMAX_DEPTH desde cero (tabla de transposición nueva)."""
+    player = AI_Player(1, max_depth=MINIMAX_DEPTH, time_limit=float("inf"), tt_mb=1, stats_timers=False)
+    player.first_move = False
+    ds_jugador = h.obtener_disjointsets(board, 1)
+    ds_oponente = h.obtener_disjointsets(board, 2)
+    player.start_time = time.time()
+    player._deadline = float("inf")
+    ordered = player.order_moves(board, player.candidate_moves(board, ds_jugador, ds_oponente), ds_jugador)
+    player.iterative_deepening(board, ds_jugador, ds_oponente, ordered)
+
+
+def casos(sizes=SIZES, fills=FILLS) -> list[tuple[str, object]]:
+    """(nombre, función sin argumentos) de cada medición."""
+    lista = []
+    for size in sizes:
+        for fill_name, fill in fills.items():
+            board = posicion(size, fill)
+            ds = h.obtener_disjointsets(board, 1)
+            sufijo = f"{size}/{fill_name}"
+            lista += [
+                (f"clone/{sufijo}", board.clone),
+                (f"check_connection/{sufijo}", lambda b=board: (b.check_connection(1), b.check_connection(2))),
+                (f"get_possible_moves/{sufijo}", board.get_possible_moves),
+                (f"evaluate_board/{sufijo}", lambda b=board, d=ds: h.evaluate_board(1, 2, b, d)),
+                (f"detectar_puentes/{sufijo}", lambda b=board, d=ds: h.detectar_puentes(b, 1, d)),
+                (f"clonar_disjointset/{sufijo}", lambda d=ds: h.clonar_disjointset(d)),
+                (f"obtener_disjointsets/{sufijo}", lambda b=board: h.obtener_disjointsets(b, 1)),
+                (f"detect_and_block_imminent_win/{sufijo}", lambda b=board: h.detect_and_block_imminent_win(b, 1)),
+            ]
+            # La búsqueda solo tiene sentido en posiciones sin ganador
+            if fill_name == "mid" and not (board.check_connection(1) or board.check_connection(2)):
+                lista.append((f"minimax_d{MINIMAX_DEPTH}/{sufijo}", lambda b=board: _minimax(b)))
+    return lista
+
+
+def ejecutar(filtro=None) -> dict:
+    """
+    Mide los casos cuyo nombre contiene `filtro` (un texto, o un conjunto de nombres exactos) y devuelve
+    {"results": segundos por llamada, "relative": cociente con la calibración, "noise": ruido del cociente},
+    cada uno un diccionario por caso. Las REPEATS muestras de cada caso se toman en pasadas sucesivas
+    sobre todos los casos, así que se reparten a lo largo de la ejecución; cada una va entre dos medias
+    muestras de calibración. Se toma la mínima y el ruido es cuánto se aleja de ella la segunda (fracción).
+    """
+    seleccion = [(nombre, funcion) for nombre, funcion in casos()
+                 if filtro is None or (nombre in filtro if isinstance(filtro, set) else filtro in nombre)]
+    veces_calibracion = max(repeticiones(calibracion) // 2, 1)
+    veces = {nombre: repeticiones(funcion) for nombre, funcion in seleccion}
+    segundos = {nombre: [] for nombre, _ in seleccion}
+    cocientes = {nombre: [] for nombre, _ in seleccion}
+    for _ in range(REPEATS):
+        for nombre, funcion in seleccion:
+            antes = muestra(calibracion, veces_calibracion)
+            valor = muestra(funcion, veces[nombre])
+            despues = muestra(calibracion, veces_calibracion)
+            segundos[nombre].append(valor)
+            cocientes[nombre].append(valor / ((antes + despues) / 2))
+    resultados = {"results": {}, "relative": {}, "noise": {}}
+    for nombre, valores in cocientes.items():
+        valores.sort()
+        resultados["results"][nombre] = min(segundos[nombre])
+        resultados["relative"][nombre] = valores[0]
+        resultados["noise"][nombre] = valores[1] / valores[0] - 1 if len(valores) > 1 else 0.0
+    return resultados
+
+
+def tolerancia(nombre: str, threshold: float, *ruidos: dict) -> float:
+    """Empeoramiento tolerado de un caso: `threshold` o NOISE_FACTOR veces el mayor ruido medido."""
+    return max([threshold] + [NOISE_FACTOR * ruido.get(nombre, 0.0) for ruido in ruidos])
+
+
+def cambios(medicion: dict, baseline: dict) -> dict:
+    """{nombre: actual / referencia - 1} de los casos de ambas, con los cocientes de calibración si los hay."""
+    clave = "relative" if "relative" in baseline else "results"
+    actual, referencia = medicion[clave], baseline[clave]
+    return {nombre: actual[nombre] / referencia[nombre] - 1 for nombre in actual if nombre in referencia}
+
+
+def comparar(medicion: dict, baseline: dict, threshold: float) -> list[tuple[str, float, float]]:
+    """
+    Casos que empeoran respecto a la referencia más que su tolerancia (ver `tolerancia`, con el ruido de
+    ambas mediciones): (nombre, segundos de referencia, segundos actuales).
+    """
+    ruidos = (baseline.get("noise", {}), medicion["noise"])
+    return [(nombre, baseline["results"][nombre], medicion["results"][nombre])
+            for nombre, cambio in cambios(medicion, baseline).items()
+            if cambio > tolerancia(nombre, threshold, *ruidos)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de los caminos críticos del tablero y las heurísticas.")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="Guardar los resultados como referencia (por defecto, benchmarks/baseline.json)")
+    parser.add_argument("--check", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="Comparar con una referencia y fallar si algún caso empeora más que --threshold "
+                             "(o que su ruido medido) también al repetir la medición")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Empeoramiento tolerado (fracción, por defecto 0.25)")
+    parser.add_argument("--filter", default=None, help="Solo los casos cuyo nombre contiene este texto")
+    args = parser.parse_args()
+
+    medicion = ejecutar(args.filter)
+    baseline = None
+    if args.check:
+        with open(args.check) as f:
+            baseline = json.load(f)
+
+    diferencias = cambios(medicion, baseline) if baseline else {}
+    for nombre, segundos in medicion["results"].items():
+        cambio = f" ({diferencias[nombre] * 100:+.0f}%)" if nombre in diferencias else ""
+        print(f"{nombre:<48} {segundos * 1e6:>12.1f} µs{cambio}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), **medicion}, f, indent=2)
+
+    if args.check:
+        regresiones = comparar(medicion, baseline, args.threshold)
+        if regresiones:
+            # Se vuelven a medir los casos sospechosos: solo cuenta la regresión que se repite
+            repeticion = ejecutar({nombre for nombre, _, _ in regresiones})
+            regresiones = comparar(repeticion, baseline, args.threshold)
+        for nombre, referencia, segundos in regresiones:
+            print(f"REGRESIÓN {nombre}: {referencia * 1e6:.1f} µs -> {segundos * 1e6:.1f} µs", file=sys.stderr)
+        if regresiones:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#benchmarks/startup.py
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Raíz del repositorio: los módulos del motor se importan desde ahí
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se ejecuta en un intérprete nuevo en cada repetición: importación en frío y primera jugada
+_MEDICION = """
+import json, sys, time
+t0 = time.perf_counter()
+from board import HexBoard
+from player import AI_Player
+import heuristics
+t1 = time.perf_counter()
+board = HexBoard({size})
+board.place_piece({size} // 2, 0, 1)
+board.place_piece({size} // 2, {size} // 2, 2)
+move = AI_Player(1, max_depth={depth}, time_limit=1e9).play(board)
+t2 = time.perf_counter()
+print(json.dumps({{"import": t1 - t0, "first_move": t2 - t1, "scipy": any(m.startswith("scipy") for m in sys.modules)}}))
+"""
+
+
+def medir(size: int = 11, depth: int = 2, runs: int = 5) -> dict:
+    """Mediana de la importación del núcleo (HexBoard, AI_Player, heuristics) y de la primera búsqueda a `depth`."""
+    codigo = _MEDICION.format(size=size, depth=depth)
+    muestras = []
+    for _ in range(runs):
+        salida = subprocess.run([sys.executable, "-c", codigo], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        muestras.append(json.loads(salida.splitlines()[-1]))
+    return {
+        "size": size,
+        "depth": depth,
+        "runs": runs,
+        "import": statistics.median(m["import"] for m in muestras),
+        "first_move": statistics.median(m["first_move"] for m in muestras),
+        "scipy_loaded": any(m["scipy"] for m in muestras),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arranque en frío del motor: importación y primera jugada.")
+    parser.add_argument("--size", type=int, default=11, help="Tamaño del tablero de la primera jugada")
+    parser.add_argument("--depth", type=int, default=2, help="Profundidad de la primera búsqueda")
+    parser.add_argument("--runs", type=int, default=5, help="Intérpretes nuevos a medir")
+    parser.add_argument("--json", default=None, help="Guardar el resultado en este fichero")
+    args = parser.parse_args()
+
+    resultado = medir(args.size, args.depth, args.runs)
+    print(f"importación {resultado['import'] * 1000:.0f} ms, primera jugada {resultado['first_move'] * 1000:.0f} ms"
+          f" ({args.size}x{args.size}, mediana de {args.runs}); scipy cargado: {resultado['scipy_loaded']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultado, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
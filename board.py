@@ -1,20 +1,57 @@
 #board.py
 
-import numpy as np
-import copy
-from scipy.cluster.hierarchy import DisjointSet
-from itertools import product
+import random
+from unionfind import UnionFind
+from geometry import geometria
+
+# Claves de Zobrist por tamaño de tablero: para cada casilla, una clave de 64 bits por jugador.
+# Se generan con una semilla fija para que el hash de una posición sea el mismo entre procesos.
+_ZOBRIST = {}
+
+def zobrist_keys(size: int) -> list[tuple[int, int]]:
+    """Devuelve (y cachea) las claves de Zobrist de un tablero de tamaño `size`."""
+    if size not in _ZOBRIST:
+        rng = random.Random(size)
+        _ZOBRIST[size] = [(rng.getrandbits(64), rng.getrandbits(64)) for _ in range(size * size)]
+    return _ZOBRIST[size]
 
 class HexBoard:
     def __init__(self, size: int):
         self.size = size  # Tamaño N del tablero (NxN)
         self.board = [[0] * size for _ in range(size)]  # Matriz NxN (0=vacío, 1=Jugador1, 2=Jugador2)
         self.player_positions = {1: set(), 2: set()}  # Registro de fichas por jugador
-        
-        
+        self._init_derived_state()
+
+    def _init_derived_state(self):
+        """Inicializa las estructuras derivadas del tablero (conectividad e historial de jugadas)."""
+        size = self.size
+        # Union-find incremental sobre las N*N casillas más cuatro nodos virtuales de borde
+        cells = size * size
+        self._left, self._right, self._top, self._bottom = cells, cells + 1, cells + 2, cells + 3
+        self._uf = UnionFind(cells + 4)
+        self._history = []  # Pila de jugadas reversibles: (fila, columna, jugador, marca del union-find)
+        self._zobrist = zobrist_keys(size)  # Compartidas por tamaño, no se copian en clone
+        self._geo = geometria(size)  # Tablas de vecinos del tamaño (compartidas, no se copian en clone)
+        self.hash = 0  # Hash de Zobrist de la posición, actualizado con cada ficha
+        self._listeners = []  # Objetos notificados en cada jugada (p. ej. IncrementalEvaluator)
+
     def clone(self):# -> HexBoard:
-        """Devuelve una copia del tablero actual"""
-        return copy.deepcopy(self)
+        """Devuelve una copia del tablero actual (sin los observadores adjuntos)"""
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)  # Las tablas por tamaño (Zobrist, geometría) se comparten
+        new.board = [row[:] for row in self.board]
+        new.player_positions = {1: set(self.player_positions[1]), 2: set(self.player_positions[2])}
+        new._uf = self._uf.copy()
+        new._history = self._history[:]
+        new._listeners = []
+        return new
+
+    def attach(self, listener):
+        """Registra un observador con métodos on_move(fila, columna, jugador) y on_undo(fila, columna, jugador)."""
+        self._listeners.append(listener)
+
+    def detach(self, listener):
+        self._listeners.remove(listener)
 
     def place_piece(self, row: int, col: int, player_id: int) -> bool:
         """Coloca una ficha si la casilla está vacía."""
@@ -22,6 +59,36 @@ class HexBoard:
         if self.board[row][col] == 0:
             self.board[row][col] = player_id
             self.player_positions[player_id].add((row, col))
+            self.hash ^= self._zobrist[row * self.size + col][player_id - 1]
+            self._connect(row, col, player_id)
+            for listener in self._listeners:
+                listener.on_move(row, col, player_id)
+            return True
+        return False
+
+    def make_move(self, row: int, col: int, player_id: int) -> bool:
+        """Coloca una ficha de forma reversible con undo_move (usado durante la búsqueda)."""
+        if self.board[row][col] != 0:
+            return False
+        mark = self._uf.mark()
+        self.board[row][col] = player_id
+        self.player_positions[player_id].add((row, col))
+        self.hash ^= self._zobrist[row * self.size + col][player_id - 1]
+        self._connect(row, col, player_id)
+        self._history.append((row, col, player_id, mark))
+        for listener in self._listeners:
+            listener.on_move(row, col, player_id)
+        return True
+
+    def undo_move(self):
+        """Deshace la última jugada hecha con make_move, restaurando el estado derivado."""
+        row, col, player_id, mark = self._history.pop()
+        self._uf.rollback(mark)
+        self.board[row][col] = 0
+        self.player_positions[player_id].discard((row, col))
+        self.hash ^= self._zobrist[row * self.size + col][player_id - 1]
+        for listener in self._listeners:
+            listener.on_undo(row, col, player_id)
 
     def get_possible_moves(self) -> list:
         """Devuelve todas las casillas vacías como tuplas (fila, columna)."""
@@ -97,45 +164,42 @@ class HexBoard:
             
     def check_connection(self, player_id: int) -> bool:
         """Verifica si el jugador ha conectado sus dos lados (Jugador 1: izquierda-derecha, Jugador 2: arriba-abajo)"""
-        
-        visited = np.zeros((self.size, self.size), dtype=bool)
-        x = [0, 0, -1, -1, 1, 1]  # Movimiento en filas (direcciones verticales)
-        y = [-1, 1, 0, 1, -1, 0]  # Movimiento en columnas (direcciones horizontales)
-        
-        def valid(x, y):
-            return 0 <= x < self.size and 0 <= y < self.size
-        
-        def search(row, col):
-            visited[row][col] = True
-            
-            # Jugador 1 (🔴): Verificar si llegó a la columna final (derecha)
-            if player_id == 1 and col == self.size - 1:
-                return True
-            # Jugador 2 (🔵): Verificar si llegó a la fila final (abajo)
-            elif player_id == 2 and row == self.size - 1:
-                return True
-            
-            for i in range(6):
-                new_row = row + x[i]
-                new_col = col + y[i]
-                if valid(new_row, new_col) and not visited[new_row][new_col] and self.board[new_row][new_col] == player_id:
-                    if search(new_row, new_col):
-                        return True
-            visited[row][col] = False
-            return False
-        
-        # Iniciar búsqueda desde los bordes correspondientes
+        # Consulta O(log n): ambos bordes objetivo pertenecen al mismo componente
         if player_id == 1:
-            # Jugador 1: Comenzar desde todas las celdas de la columna 0 (izquierda)
-            for row in range(self.size):
-                if self.board[row][0] == player_id and search(row, 0):
-                    return True
+            return self._uf.connected(self._left, self._right)
+        return self._uf.connected(self._top, self._bottom)
+
+    def group_root(self, row: int, col: int) -> int:
+        """Identificador (raíz) del componente conectado al que pertenece una casilla ocupada."""
+        return self._uf.find(row * self.size + col)
+
+    def edge_roots(self, player_id: int) -> tuple[int, int]:
+        """Raíces actuales de los dos bordes objetivo del jugador (comparables con group_root)."""
+        if player_id == 1:
+            return self._uf.find(self._left), self._uf.find(self._right)
+        return self._uf.find(self._top), self._uf.find(self._bottom)
+
+    def _connect(self, row: int, col: int, player_id: int):
+        """Une la casilla recién ocupada con sus vecinos del mismo jugador y con sus bordes objetivo."""
+        size = self.size
+        idx = row * size + col
+        union = self._uf.union
+        for nr, nc in self._geo.vecinos_rc[row][col]:
+            if self.board[nr][nc] == player_id:
+                union(idx, nr * size + nc)
+
+        if player_id == 1:
+            # Jugador 1 (🔴): bordes izquierdo y derecho
+            if col == 0:
+                union(idx, self._left)
+            if col == size - 1:
+                union(idx, self._right)
         else:
-            # Jugador 2: Comenzar desde todas las celdas de la fila 0 (arriba)
-            for col in range(self.size):
-                if self.board[0][col] == player_id and search(0, col):
-                    return True
-        return False
+            # Jugador 2 (🔵): bordes superior e inferior
+            if row == 0:
+                union(idx, self._top)
+            if row == size - 1:
+                union(idx, self._bottom)
 
     def print_board(self):
         space = ""
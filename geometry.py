@@ -0,0 +1,127 @@
+#geometry.py
+
+import numpy as np
+
+# Desplazamientos (fila, columna) de los seis vecinos de una casilla
+VECINOS = ((-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0))
+
+# Los mismos vecinos en orden circular: cada uno es adyacente al anterior y al siguiente
+ANILLO = ((-1, 0), (-1, 1), (0, 1), (1, 0), (1, -1), (0, -1))
+
+# Puentes desde una casilla: (desplazamiento del destino, portadores 1 y 2)
+PUENTES = (
+    ((-2, 1), (-1, 0), (-1, 1)),
+    ((-1, 2), (-1, 1), (0, 1)),
+    ((1, 1), (0, 1), (1, 0)),
+    ((2, -1), (1, 0), (1, -1)),
+    ((1, -2), (1, -1), (0, -1)),
+    ((-1, -1), (0, -1), (-1, 0)),
+)
+
+
+class Geometria:
+    """
+    Tablas de un tablero de tamaño N, construidas una sola vez por tamaño (ver `geometria`).
+    Son de solo lectura y se comparten entre todos los tableros de ese tamaño.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        dentro = lambda i, j: 0 <= i < size and 0 <= j < size
+
+        # Vecinos dentro del tablero: por (fila, columna) y por índice plano fila * N + columna
+        self.vecinos_rc = [[tuple((i + di, j + dj) for di, dj in VECINOS if dentro(i + di, j + dj))
+                            for j in range(size)] for i in range(size)]
+        self.vecinos = [tuple(ni * size + nj for ni, nj in self.vecinos_rc[i][j])
+                        for i in range(size) for j in range(size)]
+
+        # Puentes con el destino dentro del tablero (los portadores, entre ambos, también lo están)
+        self.puentes_rc = [[tuple(((i + ti, j + tj), (i + ai, j + aj), (i + bi, j + bj))
+                                  for (ti, tj), (ai, aj), (bi, bj) in PUENTES if dentro(i + ti, j + tj))
+                            for j in range(size)] for i in range(size)]
+
+        # Casillas (índices planos) de la primera y la última línea de los bordes de cada jugador
+        columna = lambda j: tuple(i * size + j for i in range(size))
+        fila = lambda i: tuple(i * size + j for j in range(size))
+        self.bordes = {1: (columna(0), columna(size - 1)), 2: (fila(0), fila(size - 1))}
+
+        # Vecinos ortogonales dentro del tablero (término de expansión de evaluate_board)
+        grado = np.full((size, size), 4)
+        grado[0, :] -= 1
+        grado[-1, :] -= 1
+        grado[:, 0] -= 1
+        grado[:, -1] -= 1
+        grado.flags.writeable = False
+        self.grado = grado
+
+        self._pesos = {}
+
+    def pesos_direccion(self, opponent_id: int, target_first: bool, target_second: bool) -> tuple[np.ndarray, np.ndarray]:
+        """Distancias y pesos de strategic_direction según qué bordes (izquierda/derecha o arriba/abajo) se alcanzaron."""
+        clave = (opponent_id, target_first, target_second)
+        if clave not in self._pesos:
+            distancias, pesos = _pesos_direccion(self.size, opponent_id, target_first, target_second)
+            distancias.flags.writeable = False
+            pesos.flags.writeable = False
+            self._pesos[clave] = (distancias, pesos)
+        return self._pesos[clave]
+
+    def __deepcopy__(self, memo):
+        return self  # Compartida entre copias de tableros (HexBoard.clone)
+
+
+def _pesos_direccion(size: int, opponent_id: int, target_first: bool, target_second: bool) -> tuple[np.ndarray, np.ndarray]:
+    if opponent_id == 2:
+        target_left, target_right = target_first, target_second
+
+        if target_left and not target_right:
+            # Priorizar expansión hacia la DERECHA (columnas altas)
+            distancias = (size - 1 - np.arange(size))[np.newaxis, :]  # Distancia inversa desde la izquierda
+            pesos = np.linspace(0, 1, size)[np.newaxis, :] + 1       # Penalizar menos las columnas derechas
+        elif target_right and not target_left:
+            # Priorizar expansión hacia la IZQUIERDA (columnas bajas)
+            distancias = np.arange(size)[np.newaxis, :]               # Distancia desde la derecha
+            pesos = np.linspace(1, 0, size)[np.newaxis, :] + 1       # Penalizar menos las columnas izquierdas
+        else:
+            # Centrarse en conectar ambos lados
+            centro = size // 2
+            distancias = np.abs(np.arange(size)[np.newaxis, :] - centro)
+            pesos = np.ones((size, size)) * 2
+    else:
+        target_top, target_bottom = target_first, target_second
+
+        if target_top and not target_bottom:
+            # Priorizar expansión hacia ABAJO (filas altas)
+            distancias = (size - 1 - np.arange(size))[:, np.newaxis]  # Distancia inversa desde arriba
+            pesos = np.linspace(0, 1, size)[:, np.newaxis] + 1        # Penalizar menos las filas inferiores
+        elif target_bottom and not target_top:
+            # Priorizar expansión hacia ARRIBA (filas bajas)
+            distancias = np.arange(size)[:, np.newaxis]               # Distancia desde abajo
+            pesos = np.linspace(1, 0, size)[:, np.newaxis] + 1       # Penalizar menos las filas superiores
+        else:
+            # Centrarse en conectar ambos extremos
+            centro = size // 2
+            distancias = np.abs(np.arange(size)[:, np.newaxis] - centro)
+            pesos = np.ones((size, size)) * 2
+
+    return distancias, pesos
+
+
+# Geometrías por tamaño de tablero
+_GEOMETRIAS = {}
+
+def geometria(size: int) -> Geometria:
+    """Devuelve (y cachea) la geometría de un tablero de tamaño `size`."""
+    if size not in _GEOMETRIAS:
+        _GEOMETRIAS[size] = Geometria(size)
+    return _GEOMETRIAS[size]
+
+
+_DISCOS = {}
+
+def disco_hex(radius: int) -> tuple[tuple[int, int], ...]:
+    """Desplazamientos a distancia hexagonal 1..radius de una casilla (cacheados por radio)."""
+    if radius not in _DISCOS:
+        _DISCOS[radius] = tuple((di, dj) for di in range(-radius, radius + 1) for dj in range(-radius, radius + 1)
+                                if 0 < (abs(di) + abs(dj) + abs(di + dj)) // 2 <= radius)
+    return _DISCOS[radius]
@@ -0,0 +1,325 @@
+#gtp_server.py
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from board import HexBoard
+from player import AI_Player
+from opening_book import DEFAULT_DIR
+
+NOMBRE = "hex-minimax"
+VERSION = "1.0"
+PROTOCOLO = "2"
+COLUMNAS = "abcdefghijklmnopqrstuvwxyz"
+# Colores aceptados: negro = jugador 1 (🔴, izquierda-derecha), blanco = jugador 2 (🔵, arriba-abajo)
+COLORES = {"b": 1, "black": 1, "1": 1, "w": 2, "white": 2, "2": 2}
+SIMBOLOS = {0: ".", 1: "X", 2: "O"}
+MIN_TIEMPO = 0.05  # Segundos mínimos por jugada con time_settings
+
+
+class ErrorGTP(Exception):
+    """Comando inválido: se responde con '? mensaje'."""
+
+
+# Estado de cada proceso del pool (se fija en _init_worker): un AI_Player por (tamaño, jugador) que
+# conserva su tabla de transposición y sus libros de aperturas entre jugadas y partidas
+_OPCIONES = {}
+_JUGADORES = {}
+
+
+def _jugador(size: int, player_id: int) -> AI_Player:
+    if (size, player_id) not in _JUGADORES:
+        _JUGADORES[(size, player_id)] = AI_Player(player_id, **_OPCIONES)
+    return _JUGADORES[(size, player_id)]
+
+
+def _init_worker(opciones: dict, sizes: tuple):
+    """Crea los jugadores de los tamaños de `sizes` y carga sus libros antes de la primera petición."""
+    global _OPCIONES
+    _OPCIONES = opciones
+    for size in sizes:
+        for player_id in (1, 2):
+            _jugador(size, player_id).book_move(HexBoard(size))
+
+
+def _genmove(cells: list, size: int, player_id: int, time_limit: float) -> tuple[tuple[int, int], dict]:
+    """Jugada de `player_id` en la posición `cells` (lista plana) y sus estadísticas."""
+    board = HexBoard(size)
+    for idx, cell in enumerate(cells):
+        if cell:
+            board.place_piece(idx // size, idx % size, cell)
+    player = _jugador(size, player_id)
+    player.time_limit = time_limit
+    player.first_move = True  # Como un jugador nuevo: la apertura solo se usa sin fichas propias
+    move, stats = player.play_with_stats(board)
+    return move, stats.as_dict()
+
+
+def parse_color(arg: str) -> int:
+    try:
+        return COLORES[arg.lower()]
+    except KeyError:
+        raise ErrorGTP("invalid color") from None
+
+
+def parse_vertex(arg: str, size: int) -> tuple[int, int]:
+    """'c5' -> (4, 2): la letra es la columna y el número la fila (desde 1)."""
+    arg = arg.lower()
+    if len(arg) < 2 or arg[0] not in COLUMNAS or not arg[1:].isdigit():
+        raise ErrorGTP("invalid vertex")
+    row, col = int(arg[1:]) - 1, COLUMNAS.index(arg[0])
+    if not (0 <= row < size and 0 <= col < size):
+        raise ErrorGTP("invalid vertex")
+    return row, col
+
+
+def format_vertex(move: tuple[int, int]) -> str:
+    return f"{COLUMNAS[move[1]]}{move[0] + 1}"
+
+
+class SesionGTP:
+    """
+    Una partida controlada por GTP (una conexión o la entrada estándar). Las jugadas del motor se piden
+    siempre al mismo proceso del servidor, así su tabla de transposición sigue caliente durante la partida.
+    """
+
+    def __init__(self, executor: ProcessPoolExecutor, size: int, time_limit: float):
+        self.executor = executor
+        self.time_limit = time_limit
+        self.tiempo_defecto = time_limit  # Tiempo por jugada sin límite de reloj (--time)
+        self.last_stats = {}
+        self.comandos = {
+            "protocol_version": self.cmd_protocol_version,
+            "name": self.cmd_name,
+            "version": self.cmd_version,
+            "known_command": self.cmd_known_command,
+            "list_commands": self.cmd_list_commands,
+            "boardsize": self.cmd_boardsize,
+            "clear_board": self.cmd_clear_board,
+            "play": self.cmd_play,
+            "genmove": self.cmd_genmove,
+            "undo": self.cmd_undo,
+            "showboard": self.cmd_showboard,
+            "time_settings": self.cmd_time_settings,
+            "hex-stats": self.cmd_stats,
+            "quit": self.cmd_quit,
+        }
+        self._nueva_partida(size)
+
+    def _nueva_partida(self, size: int):
+        self.board = HexBoard(size)
+        self.moves = []
+
+    async def ejecutar(self, linea: str) -> tuple[str | None, bool]:
+        """Ejecuta una línea del protocolo. Devuelve (respuesta o None si la línea está vacía, terminar)."""
+        partes = linea.split("#", 1)[0].split()
+        if not partes:
+            return None, False
+        ident = ""
+        if partes[0].isdigit():
+            ident, partes = partes[0], partes[1:]
+        if not partes:
+            return f"?{ident} missing command\n\n", False
+        comando, args = partes[0].lower(), partes[1:]
+        if comando not in self.comandos:
+            return f"?{ident} unknown command\n\n", False
+        try:
+            resultado = await self.comandos[comando](args)
+        except ErrorGTP as e:
+            return f"?{ident} {e}\n\n", False
+        return f"={ident} {resultado}".rstrip(" ") + "\n\n", comando == "quit"
+
+    async def cmd_protocol_version(self, args):
+        return PROTOCOLO
+
+    async def cmd_name(self, args):
+        return NOMBRE
+
+    async def cmd_version(self, args):
+        return VERSION
+
+    async def cmd_known_command(self, args):
+        return "true" if args and args[0].lower() in self.comandos else "false"
+
+    async def cmd_list_commands(self, args):
+        return "\n".join(self.comandos)
+
+    async def cmd_boardsize(self, args):
+        if len(args) != 1 or not args[0].isdigit() or not 1 <= int(args[0]) <= len(COLUMNAS):
+            raise ErrorGTP("unacceptable size")
+        self._nueva_partida(int(args[0]))
+        return ""
+
+    async def cmd_clear_board(self, args):
+        self._nueva_partida(self.board.size)
+        return ""
+
+    async def cmd_play(self, args):
+        if len(args) != 2:
+            raise ErrorGTP("syntax error")
+        player_id = parse_color(args[0])
+        row, col = parse_vertex(args[1], self.board.size)
+        if not self.board.place_piece(row, col, player_id):
+            raise ErrorGTP("illegal move")
+        self.moves.append((row, col, player_id))
+        return ""
+
+    async def cmd_genmove(self, args):
+        if len(args) != 1:
+            raise ErrorGTP("syntax error")
+        player_id = parse_color(args[0])
+        board = self.board
+        if board.check_connection(3 - player_id) or not board.get_possible_moves():
+            return "resign"
+        cells = [cell for row in board.board for cell in row]
+        loop = asyncio.get_running_loop()
+        move, self.last_stats = await loop.run_in_executor(
+            self.executor, _genmove, cells, board.size, player_id, self.time_limit)
+        if move == (-1, -1) or not board.place_piece(move[0], move[1], player_id):
+            return "resign"
+        self.moves.append((move[0], move[1], player_id))
+        return format_vertex(move)
+
+    async def cmd_undo(self, args):
+        if not self.moves:
+            raise ErrorGTP("cannot undo")
+        moves = self.moves[:-1]
+        self._nueva_partida(self.board.size)
+        for row, col, player_id in moves:
+            self.board.place_piece(row, col, player_id)
+        self.moves = moves
+        return ""
+
+    async def cmd_showboard(self, args):
+        size = self.board.size
+        lineas = ["   " + " ".join(COLUMNAS[:size])]
+        for i, row in enumerate(self.board.board):
+            lineas.append(" " * i + f"{i + 1:>2} " + " ".join(SIMBOLOS[cell] for cell in row))
+        return "\n" + "\n".join(lineas)
+
+    async def cmd_time_settings(self, args):
+        """
+        time_settings main byo_yomi stones: con byo-yomi, su periodo repartido entre sus `stones` jugadas
+        (el tiempo principal queda de reserva); sin byo-yomi, el principal repartido entre las jugadas
+        esperadas. byo_yomi > 0 con stones = 0 significa sin límite de tiempo (especificación GTP):
+        se vuelve al tiempo por jugada del servidor.
+        """
+        if len(args) != 3:
+            raise ErrorGTP("syntax error")
+        try:
+            main_time, byo_yomi, stones = float(args[0]), float(args[1]), int(args[2])
+        except ValueError:
+            raise ErrorGTP("syntax error") from None
+        if not (math.isfinite(main_time) and math.isfinite(byo_yomi)) or min(main_time, byo_yomi, stones) < 0:
+            raise ErrorGTP("syntax error")
+        if byo_yomi > 0 and stones == 0:
+            self.time_limit = self.tiempo_defecto
+        elif byo_yomi > 0:
+            self.time_limit = max(byo_yomi / stones, MIN_TIEMPO)
+        else:
+            size = self.board.size
+            self.time_limit = max(main_time / max(size * size // 2, 1), MIN_TIEMPO)
+        return ""
+
+    async def cmd_stats(self, args):
+        return json.dumps(self.last_stats, allow_nan=False)
+
+    async def cmd_quit(self, args):
+        return ""
+
+
+class ServidorGTP:
+    """
+    Servidor GTP de larga duración: cada conexión (o la entrada estándar) es una partida y las jugadas
+    se calculan en `workers` procesos con jugadores persistentes. Cada partida se asigna a un proceso
+    fijo (por turnos), así que muchas partidas simultáneas comparten el pool sin perder sus tablas.
+    """
+
+    def __init__(self, workers: int = 1, size: int = 11, time_limit: float = 5.0, warm_sizes: tuple = (),
+                 **opciones):
+        opciones.setdefault("opening_book", DEFAULT_DIR)
+        self.size = size
+        self.time_limit = time_limit
+        self.executors = [ProcessPoolExecutor(1, initializer=_init_worker, initargs=(opciones, tuple(warm_sizes)))
+                          for _ in range(max(workers, 1))]
+        self._sesiones = 0
+
+    def nueva_sesion(self) -> SesionGTP:
+        executor = self.executors[self._sesiones % len(self.executors)]
+        self._sesiones += 1
+        return SesionGTP(executor, self.size, self.time_limit)
+
+    async def atender(self, reader: asyncio.StreamReader, escribir):
+        """Lee comandos hasta 'quit' o fin de la entrada; `escribir(texto)` es una corrutina."""
+        sesion = self.nueva_sesion()
+        while True:
+            linea = await reader.readline()
+            if not linea:
+                break
+            respuesta, terminar = await sesion.ejecutar(linea.decode(errors="replace"))
+            if respuesta is not None:
+                await escribir(respuesta)
+            if terminar:
+                break
+
+    async def stdio(self):
+        """Una sola partida por la entrada y la salida estándar."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        async def escribir(texto):
+            sys.stdout.write(texto)
+            sys.stdout.flush()
+
+        await self.atender(reader, escribir)
+
+    async def tcp(self, host: str, port: int):
+        """Una partida por conexión TCP, todas atendidas a la vez."""
+        async def conexion(reader, writer):
+            async def escribir(texto):
+                writer.write(texto.encode())
+                await writer.drain()
+            try:
+                await self.atender(reader, escribir)
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(conexion, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        for executor in self.executors:
+            executor.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor GTP del motor minimax de Hex.")
+    parser.add_argument("--port", type=int, default=None, help="Escuchar en este puerto TCP (por defecto, stdin/stdout)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos que calculan las jugadas")
+    parser.add_argument("--size", type=int, default=11, help="Tamaño inicial del tablero")
+    parser.add_argument("--time", type=float, default=5.0, help="Segundos por jugada (hasta time_settings)")
+    parser.add_argument("--tt-mb", type=float, default=16.0, help="Tamaño de la tabla de transposición por jugador")
+    parser.add_argument("--book", default=DEFAULT_DIR, help="Libro de aperturas (fichero o directorio)")
+    parser.add_argument("--warm", nargs="*", type=int, default=[], help="Tamaños a precargar en cada proceso")
+    args = parser.parse_args()
+
+    servidor = ServidorGTP(args.workers, args.size, args.time, args.warm, tt_mb=args.tt_mb, opening_book=args.book)
+    try:
+        if args.port is None:
+            asyncio.run(servidor.stdio())
+        else:
+            asyncio.run(servidor.tcp(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,13 @@
 from board import HexBoard
 import random
 import numpy as np
-from scipy.cluster.hierarchy import DisjointSet
-from scipy.signal import convolve2d
+from unionfind import UnionFind
+from geometry import geometria, VECINOS
 
 def es_tablero_vacio(player_id, board: HexBoard) -> bool:
         return all(cell != player_id for row in board.board for cell in row)
 
-def elegir_apertura(player_id: int, board: HexBoard, size: int) -> tuple[int, int]:
+def elegir_apertura(player_id: int, board: HexBoard, size: int, rng: random.Random | None = None) -> tuple[int, int]:
     aperturas = []
     if player_id == 2:  # Jugador 2 (vertical: necesita conectar arriba-abajo)
         aperturas = [
@@ -24,7 +24,7 @@ def elegir_apertura(player_id: int, board: HexBoard, size: int) -> tuple[int, in
         ]
     # Filtrar aperturas válidas (que no estén ocupadas)
     valid_moves = [m for m in aperturas if board.board[m[0]][m[1]] == 0]
-    return random.choice(valid_moves) if valid_moves else (size//2, size//2)
+    return (rng or random).choice(valid_moves) if valid_moves else (size//2, size//2)
 
 
 def detect_and_block_imminent_win(board: HexBoard, ai_id: int) -> tuple[int, tuple | None]:
@@ -37,71 +37,99 @@ def detect_and_block_imminent_win(board: HexBoard, ai_id: int) -> tuple[int, tup
     """
     opponent_id = 3 - ai_id
     board_size = board.size
-    opponent_pieces = sum(row.count(opponent_id) for row in board.board)
+    opponent_pieces = len(board.player_positions[opponent_id])
 
     if opponent_pieces < board_size - 1:
         return (1, None)  # Demasiado pronto para preocuparse
 
-    threat_moves = []
-
-    for move in board.get_possible_moves():
-        row, col = move
-        new_board = board.clone()
-        new_board.place_piece(row, col, opponent_id)
-
-        if new_board.check_connection(opponent_id):
-            threat_moves.append(move)
-            if len(threat_moves) > 1:
-                return (-1, threat_moves[0])  # Hay más de una amenaza
+    threat_moves, _ = detectar_amenazas(board, opponent_id)
 
+    if len(threat_moves) > 1:
+        return (-1, threat_moves[0])  # Hay más de una amenaza
     if len(threat_moves) == 1:
         return (0, threat_moves[0])  # Único movimiento que permite bloquear
     return (1, None)  # No hay amenazas detectadas
 
-def strategic_direction(board: HexBoard, opponent_id: int, ds: DisjointSet) -> tuple[np.ndarray, np.ndarray]:
+def detectar_amenazas(board: HexBoard, player_id: int) -> tuple[list, list]:
+    """
+    Recorre una sola vez las casillas vacías usando los componentes del tablero y sus bordes.
+    Devuelve (ganadoras, puentes):
+    - ganadoras: casillas donde una ficha de `player_id` conecta sus dos bordes.
+    - puentes: casillas donde una ficha los conecta virtualmente (cada borde tocado directamente
+      o mediante un puente con portadores vacíos y distintos), sin ganar aún.
+    """
     size = board.size
-    grupos = list(ds.subsets())
-    
-    if opponent_id == 2:
-        # Jugador 1 (🔴): Conectar IZQUIERDA-DERECHA (horizontal)
-        target_left = any(any(j == 0 for (i, j) in grupo) for grupo in grupos)
-        target_right = any(any(j == size - 1 for (i, j) in grupo) for grupo in grupos)
-        
-        if target_left and not target_right:
-            # Priorizar expansión hacia la DERECHA (columnas altas)
-            distancias = (size - 1 - np.arange(size))[np.newaxis, :]  # Distancia inversa desde la izquierda
-            pesos = np.linspace(0, 1, size)[np.newaxis, :] + 1       # Penalizar menos las columnas derechas
-        elif target_right and not target_left:
-            # Priorizar expansión hacia la IZQUIERDA (columnas bajas)
-            distancias = np.arange(size)[np.newaxis, :]               # Distancia desde la derecha
-            pesos = np.linspace(1, 0, size)[np.newaxis, :] + 1       # Penalizar menos las columnas izquierdas
-        else:
-            # Centrarse en conectar ambos lados
-            centro = size // 2
-            distancias = np.abs(np.arange(size)[np.newaxis, :] - centro)
-            pesos = np.ones((size, size)) * 2
-    else:
-        # Jugador 2 (🔵): Conectar ARRIBA-ABAJO (vertical)
-        target_top = any(any(i == 0 for (i, j) in grupo) for grupo in grupos)
-        target_bottom = any(any(i == size - 1 for (i, j) in grupo) for grupo in grupos)
-        
-        if target_top and not target_bottom:
-            # Priorizar expansión hacia ABAJO (filas altas)
-            distancias = (size - 1 - np.arange(size))[:, np.newaxis]  # Distancia inversa desde arriba
-            pesos = np.linspace(0, 1, size)[:, np.newaxis] + 1        # Penalizar menos las filas inferiores
-        elif target_bottom and not target_top:
-            # Priorizar expansión hacia ARRIBA (filas bajas)
-            distancias = np.arange(size)[:, np.newaxis]               # Distancia desde abajo
-            pesos = np.linspace(1, 0, size)[:, np.newaxis] + 1       # Penalizar menos las filas superiores
-        else:
-            # Centrarse en conectar ambos extremos
-            centro = size // 2
-            distancias = np.abs(np.arange(size)[:, np.newaxis] - centro)
-            pesos = np.ones((size, size)) * 2
-
-    return distancias, pesos
-
-def evaluate_board(player_id: int, opponent_id: int, board: HexBoard, ds: DisjointSet) -> float:
+    cells = board.board
+    geo = geometria(size)
+    root_a, root_b = board.edge_roots(player_id)
+    ganadoras = []
+    puentes = []
+
+    for row in range(size):
+        for col in range(size):
+            if cells[row][col] != 0:
+                continue
+
+            # Enlaces directos: grupos vecinos y bordes sobre los que está la casilla
+            directos = set()
+            for ni, nj in geo.vecinos_rc[row][col]:
+                if cells[ni][nj] == player_id:
+                    directos.add(board.group_root(ni, nj))
+            eje = col if player_id == 1 else row
+            if eje == 0:
+                directos.add(root_a)
+            if eje == size - 1:
+                directos.add(root_b)
+
+            if root_a in directos and root_b in directos:
+                ganadoras.append((row, col))
+                continue
+
+            # Enlaces virtuales: (raíz alcanzada, portadores) por puentes a fichas propias o al borde
+            virtuales = []
+            for t, a, b in geo.puentes_rc[row][col]:
+                if cells[t[0]][t[1]] == player_id \
+                        and cells[a[0]][a[1]] == 0 and cells[b[0]][b[1]] == 0:
+                    virtuales.append((board.group_root(*t), {a, b}))
+            # Plantillas de borde: las dos casillas vecinas sobre el borde están vacías
+            plantillas = []
+            if eje == 1:
+                lado = [(row, 0), (row + 1, 0)] if player_id == 1 else [(0, col), (0, col + 1)]
+                plantillas.append((root_a, lado))
+            if eje == size - 2:
+                lado = [(row - 1, size - 1), (row, size - 1)] if player_id == 1 else [(size - 1, col - 1), (size - 1, col)]
+                plantillas.append((root_b, lado))
+            for raiz, lado in plantillas:
+                if all(valid_position(p, size) and cells[p[0]][p[1]] == 0 for p in lado):
+                    virtuales.append((raiz, set(lado)))
+
+            enlaces_a = [set()] if root_a in directos else [c for r, c in virtuales if r == root_a]
+            enlaces_b = [set()] if root_b in directos else [c for r, c in virtuales if r == root_b]
+            if any(not (ca & cb) for ca in enlaces_a for cb in enlaces_b):
+                puentes.append((row, col))
+
+    return ganadoras, puentes
+
+def strategic_direction(board: HexBoard, opponent_id: int, ds: UnionFind) -> tuple[np.ndarray, np.ndarray]:
+    target_first, target_second = strategic_direction_targets(board.size, opponent_id, ds)
+    return pesos_direccion(board.size, opponent_id, target_first, target_second)
+
+def strategic_direction_targets(size: int, opponent_id: int, ds: UnionFind) -> tuple[bool, bool]:
+    """Bordes (izquierda/derecha o arriba/abajo) que ya tocan los grupos de `ds`."""
+    # opponent_id == 2 mira las columnas (bordes IZQUIERDA-DERECHA del jugador 1 🔴) y
+    # opponent_id == 1 las filas (bordes ARRIBA-ABAJO del jugador 2 🔵).
+    # Algún grupo toca el borde si alguna de sus casillas está en esa línea
+    primera, ultima = geometria(size).bordes[3 - opponent_id]
+    target_first = any(idx in ds for idx in primera)
+    target_second = any(idx in ds for idx in ultima)
+
+    return target_first, target_second
+
+def pesos_direccion(size: int, opponent_id: int, target_first: bool, target_second: bool) -> tuple[np.ndarray, np.ndarray]:
+    """Distancias y pesos de strategic_direction (cacheados y de solo lectura en la geometría del tamaño)."""
+    return geometria(size).pesos_direccion(opponent_id, target_first, target_second)
+
+def evaluate_board(player_id: int, opponent_id: int, board: HexBoard, ds: UnionFind) -> float:
     size = board.size
     board_np = np.array(board.board)
     
@@ -116,55 +144,129 @@ def evaluate_board(player_id: int, opponent_id: int, board: HexBoard, ds: Disjoi
     # 3. Fronteras activas (casillas vacías adyacentes a nuestras fichas)
     fronteras = np.sum(board_np == 0) / (size * size) * 10  # Normalizar
 
-    # 4. Detección de patrones no lineales
-    kernel = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]])  # Patrón diamante
-    expansion_score = np.sum(convolve2d(board_np == player_id, kernel, mode='same') * 0.2)
+    # 4. Detección de patrones no lineales: la suma de la convolución de las fichas propias con el
+    #    patrón diamante [[0,1,0],[1,0,1],[0,1,0]] es la suma de sus vecinos ortogonales en el tablero
+    expansion_score = np.sum(geometria(size).grado[board_np == player_id]) * 0.2
     
     return (direction_score * 0.5) + (puentes_score * 0.3) + (fronteras * 0.05) + (expansion_score * 0.25)
 
 
-def clonar_disjointset(ds_original: DisjointSet) -> DisjointSet:
-    """Clona un DisjointSet de SciPy reconstruyendo sus componentes."""
-    ds_clon = DisjointSet()
-    for subset in ds_original.subsets():
-        for elemento in subset:
-            ds_clon.add(elemento)
-        # Conectar elementos dentro del subset
-        elementos = list(subset)
-        for i in range(1, len(elementos)):
-            ds_clon.merge(elementos[0], elementos[i])
-    return ds_clon
-
-def obtener_disjointsets(board: HexBoard, player_id: int) -> DisjointSet:
-    """Crea un DisjointSet con las fichas del jugador."""
-    ds = DisjointSet()
+def evaluar_movimientos(player_id: int, opponent_id: int, board: HexBoard, ds: UnionFind) -> list:
+    """
+    Puntúa todas las jugadas de `player_id` en una pasada vectorizada.
+    Para cada casilla vacía m devuelve (m, valor) con el mismo valor que evaluate_board sobre el hijo
+    (tablero con la ficha en m y `ds` con m conectada), calculando cada término como un delta.
+    """
+    size = board.size
+    board_np = np.array(board.board)
+    propias = board_np == player_id
+    flat = board_np.ravel()
+    vacias = np.flatnonzero(flat == 0)
+    n_vacias = len(vacias)
+    if n_vacias == 0:
+        return []
+    rows, cols = np.divmod(vacias, size)
+
+    # 1. Dirección estratégica: la jugada puede alcanzar un borde y cambiar la configuración de pesos
+    #    (strategic_direction recibe player_id como `opponent_id`: 2 mira columnas, 1 mira filas)
+    eje = cols if player_id == 2 else rows
+    target_first, target_second = strategic_direction_targets(size, player_id, ds)
+    first = target_first | (eje == 0)
+    second = target_second | (eje == size - 1)
+    valores = np.empty((4, size, size))
+    for combo in range(4):
+        distancias, pesos = pesos_direccion(size, player_id, bool(combo & 2), bool(combo & 1))
+        valores[combo] = np.broadcast_to((size - distancias) / pesos, (size, size))
+    base = valores[:, propias].sum(axis=1)
+    combo = first.astype(int) * 2 + second.astype(int)
+    direction_score = base[combo] + valores[combo, rows, cols]
+
+    # 2. Puentes: A[e, g] indica si la vacía e toca el grupo g; al jugar en m se fusionan los grupos de m
+    propias_idx = np.flatnonzero(propias.ravel())
+    raices = {}
+    grupo = np.full(size * size, -1)
+    for idx in propias_idx:
+        grupo[idx] = raices.setdefault(ds.find(int(idx)), len(raices))
+    posicion = np.full(size * size, -1)
+    posicion[vacias] = np.arange(n_vacias)
+    toca = np.zeros((n_vacias, max(len(raices), 1)), dtype=np.int64)
+    adyacentes = np.zeros((n_vacias, n_vacias), dtype=bool)
+    for di, dj in VECINOS:
+        ni, nj = rows + di, cols + dj
+        dentro = (ni >= 0) & (ni < size) & (nj >= 0) & (nj < size)
+        vecino = ni[dentro] * size + nj[dentro]
+        origen = np.flatnonzero(dentro)
+        es_propia = grupo[vecino] >= 0
+        toca[origen[es_propia], grupo[vecino[es_propia]]] = 1
+        es_vacia = posicion[vecino] >= 0
+        adyacentes[origen[es_vacia], posicion[vecino[es_vacia]]] = True
+
+    comunes = toca @ toca.T                            # |grupos(m) ∩ grupos(e)|
+    grupos_hijo = toca.sum(axis=1)[np.newaxis, :] - comunes + ((comunes > 0) | adyacentes)
+    if player_id == 1:
+        bonus = np.isin(cols, [0, size - 1])
+    else:
+        bonus = np.isin(rows, [0, size - 1])
+    puntos = np.where(grupos_hijo >= 2, 15 * grupos_hijo + 20 * bonus[np.newaxis, :], 0)
+    np.fill_diagonal(puntos, 0)                        # m deja de ser una casilla vacía
+    puentes_score = puntos.sum(axis=1)
+
+    # 3. Fronteras activas: una casilla vacía menos
+    fronteras = (n_vacias - 1) / (size * size) * 10
+
+    # 4. Expansión: grado ortogonal de las fichas propias más el de m (ver evaluate_board)
+    grado = geometria(size).grado
+    expansion_score = (grado[propias].sum() + grado[rows, cols]) * 0.2
+
+    scores = (direction_score * 0.5) + (puentes_score * 0.3) + (fronteras * 0.05) + (expansion_score * 0.25)
+    return [((int(r), int(c)), float(v)) for r, c, v in zip(rows, cols, scores)]
+
+def clonar_disjointset(ds_original: UnionFind) -> UnionFind:
+    """Clona un UnionFind (copia de sus listas). La búsqueda usa mark/rollback en lugar de clonar."""
+    return ds_original.copy()
+
+def obtener_disjointsets(board: HexBoard, player_id: int) -> UnionFind:
+    """Crea un UnionFind (indexado por fila * N + columna) con las fichas del jugador."""
     size = board.size
-    # Primero agregar todas las celdas del jugador al DisjointSet
-    for i in range(size):
-        for j in range(size):
-            if board.board[i][j] == player_id:
-                ds.add((i, j))
+    vecinos = geometria(size).vecinos
+    flat = [cell for row in board.board for cell in row]
+    ds = UnionFind(size * size)
+    propias = [idx for idx, cell in enumerate(flat) if cell == player_id]
+    # Primero agregar todas las celdas del jugador
+    for idx in propias:
+        ds.add(idx)
     # Luego, conectar las celdas con sus vecinos
-    for i in range(size):
-        for j in range(size):
-            if board.board[i][j] == player_id:
-                for di, dj in [(-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0)]:
-                    ni, nj = i + di, j + dj
-                    if valid_position((ni, nj), size) and board.board[ni][nj] == player_id:
-                        ds.merge((i, j), (ni, nj))
+    for idx in propias:
+        for n in vecinos[idx]:
+            if flat[n] == player_id:
+                ds.union(idx, n)
     return ds
 
-def detectar_puentes(board: HexBoard, player_id: int, ds: DisjointSet) -> list:
-    """Detecta puentes usando el DisjointSet pre-calculado."""
+def conectar_ficha(board: HexBoard, ds: UnionFind, move: tuple[int, int], player_id: int) -> int:
+    """
+    Añade al UnionFind la ficha ya colocada en `move` y la une con sus vecinos del jugador.
+    Devuelve la marca para deshacerlo con `ds.rollback`.
+    """
+    size = board.size
+    mark = ds.mark()
+    idx = move[0] * size + move[1]
+    ds.add(idx)
+    for ni, nj in geometria(size).vecinos_rc[move[0]][move[1]]:
+        if board.board[ni][nj] == player_id:
+            ds.union(idx, ni * size + nj)
+    return mark
+
+def detectar_puentes(board: HexBoard, player_id: int, ds: UnionFind) -> list:
+    """Detecta puentes usando el UnionFind pre-calculado."""
     puentes = []
+    vecinos_rc = geometria(board.size).vecinos_rc
     for move in board.get_possible_moves():
         grupos_conectados = set()
-        for di, dj in [(-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0)]:
-            ni, nj = move[0] + di, move[1] + dj
-            # Verificar si la celda es del jugador y está en el DisjointSet
-            if valid_position((ni, nj), board.size) and board.board[ni][nj] == player_id:
+        for ni, nj in vecinos_rc[move[0]][move[1]]:
+            # Verificar si la celda es del jugador y está en el UnionFind
+            if board.board[ni][nj] == player_id:
                 try:
-                    grupos_conectados.add(ds.__getitem__((ni, nj)))
+                    grupos_conectados.add(ds[ni * board.size + nj])
                 except KeyError:
                     continue  # Ignorar celdas no registradas
 
@@ -179,6 +281,57 @@ def detectar_puentes(board: HexBoard, player_id: int, ds: DisjointSet) -> list:
     
     return puentes
 
+def distancia_a_fichas(board: HexBoard, player_ids: tuple = (1, 2)) -> list[list[int]]:
+    """Distancia hexagonal de cada casilla a la ficha más cercana de `player_ids` (BFS desde todas ellas)."""
+    size = board.size
+    vecinos_rc = geometria(size).vecinos_rc
+    infinito = size * size
+    dist = [[infinito] * size for _ in range(size)]
+    frontera = [pos for p in player_ids for pos in board.player_positions[p]]
+    for row, col in frontera:
+        dist[row][col] = 0
+    d = 0
+    while frontera:
+        d += 1
+        siguiente = []
+        for row, col in frontera:
+            for ni, nj in vecinos_rc[row][col]:
+                if dist[ni][nj] > d:
+                    dist[ni][nj] = d
+                    siguiente.append((ni, nj))
+        frontera = siguiente
+    return dist
+
+def ventana_candidatas(board: HexBoard, radius: int) -> tuple[set, int]:
+    """
+    Casillas vacías a distancia <= radius de alguna ficha y, para cada jugador, las de sus primeras
+    `radius` líneas de borde a distancia <= 2 * radius de sus fichas (plantillas de borde).
+    Si alguna amenaza de detectar_amenazas (de cualquier jugador) queda fuera, el radio se amplía
+    hasta incluirla. Devuelve (casillas, radio usado). Sin fichas en el tablero, todas las vacías.
+    """
+    size = board.size
+    cells = board.board
+    vacias = [(i, j) for i in range(size) for j in range(size) if cells[i][j] == 0]
+    if not board.player_positions[1] and not board.player_positions[2]:
+        return set(vacias), radius
+
+    dist = {p: distancia_a_fichas(board, (p,)) for p in (1, 2)}
+    cercania = [[min(dist[1][i][j], dist[2][i][j]) for j in range(size)] for i in range(size)]
+    amenazas = [m for p in (1, 2) for lista in detectar_amenazas(board, p) for m in lista]
+    radius = max([radius] + [cercania[i][j] for i, j in amenazas])
+
+    ventana = set()
+    for i, j in vacias:
+        if cercania[i][j] <= radius:
+            ventana.add((i, j))
+            continue
+        for p in (1, 2):
+            linea = min(j, size - 1 - j) if p == 1 else min(i, size - 1 - i)
+            if linea < radius and dist[p][i][j] <= 2 * radius:
+                ventana.add((i, j))
+                break
+    return ventana, radius
+
 def valid_position(pos: tuple[int, int], size: int) -> bool:
     """Verifica si una posición (fila, columna) está dentro del tablero."""
     row, col = pos
@@ -0,0 +1,166 @@
+# incremental_eval.py
+
+import numpy as np
+from board import HexBoard
+from unionfind import UnionFind
+import heuristics as h
+from geometry import geometria
+
+
+class IncrementalEvaluator:
+    """
+    Mantiene los términos de heuristics.evaluate_board(player_id, 3 - player_id, board, ds) de un jugador
+    y los actualiza en cada jugada del tablero al que está adjunto (board.attach / board.detach).
+    `value()` devuelve el mismo resultado que evaluate_board con el UnionFind de las fichas del jugador.
+    """
+
+    def __init__(self, board: HexBoard, player_id: int):
+        self.board = board
+        self.player_id = player_id
+        size = board.size
+        self.size = size
+        geo = geometria(size)
+        self._vecinos = geo.vecinos_rc
+        self._uf = UnionFind(size * size)
+        self._stack = []  # Por jugada: (marca del uf, [(casilla, puntos de puente previos)], total de puentes previo)
+
+        # 1. Dirección estratégica: suma por cada combinación de bordes alcanzados (ver pesos_direccion)
+        self._valores = []
+        for combo in range(4):
+            distancias, pesos = h.pesos_direccion(size, player_id, bool(combo & 2), bool(combo & 1))
+            self._valores.append(np.broadcast_to((size - distancias) / pesos, (size, size)).ravel().tolist())
+        self._dir_sums = [0.0] * 4
+        self._edge_counts = [0, 0]  # Fichas en el primer y segundo borde de strategic_direction
+
+        # 4. Expansión: vecinos ortogonales dentro del tablero de cada casilla
+        self._grado = geo.grado.ravel().tolist()
+        self._exp_sum = 0
+
+        # 3. Fronteras: casillas vacías del tablero
+        self._empties = 0
+
+        # 2. Puentes: puntos actuales de cada casilla vacía y su total
+        self._bridge = [0] * (size * size)
+        self._bridge_total = 0
+
+        for i in range(size):
+            for j in range(size):
+                cell = board.board[i][j]
+                if cell == player_id:
+                    self._add_stone(i, j)
+                elif cell == 0:
+                    self._empties += 1
+        for i in range(size):
+            for j in range(size):
+                if board.board[i][j] == 0:
+                    idx = i * size + j
+                    self._bridge[idx] = self._bridge_points(i, j)
+                    self._bridge_total += self._bridge[idx]
+
+    def value(self) -> float:
+        size = self.size
+        combo = (self._edge_counts[0] > 0) * 2 + (self._edge_counts[1] > 0)
+        direction_score = self._dir_sums[combo]
+        fronteras = self._empties / (size * size) * 10
+        expansion_score = self._exp_sum * 0.2
+        return (direction_score * 0.5) + (self._bridge_total * 0.3) + (fronteras * 0.05) + (expansion_score * 0.25)
+
+    def on_move(self, row: int, col: int, player_id: int):
+        size = self.size
+        idx = row * size + col
+        mark = self._uf.mark()
+        previos = [(idx, self._bridge[idx])]
+        total_previo = self._bridge_total
+        self._bridge_total -= self._bridge[idx]
+        self._bridge[idx] = 0
+        self._empties -= 1
+
+        if player_id == self.player_id:
+            grupos = self._add_stone(row, col)
+            # Casillas cuyo conteo de grupos vecinos puede cambiar: vecinas de la ficha y,
+            # si se fusionaron grupos, las vecinas de cualquier ficha del grupo resultante
+            afectadas = self._empty_neighbors(row, col) if grupos < 2 else self._group_liberties(row, col)
+            for i, j in afectadas:
+                k = i * size + j
+                previos.append((k, self._bridge[k]))
+                nuevo = self._bridge_points(i, j)
+                self._bridge_total += nuevo - self._bridge[k]
+                self._bridge[k] = nuevo
+
+        self._stack.append((mark, previos, total_previo))
+
+    def on_undo(self, row: int, col: int, player_id: int):
+        mark, previos, total_previo = self._stack.pop()
+        for k, puntos in reversed(previos):
+            self._bridge[k] = puntos
+        self._bridge_total = total_previo
+        self._empties += 1
+        if player_id == self.player_id:
+            idx = row * self.size + col
+            self._update_stone_terms(row, col, idx, -1)
+            self._uf.rollback(mark)
+
+    def _add_stone(self, row: int, col: int) -> int:
+        """Añade una ficha propia; devuelve cuántos grupos distintos tocaba antes de unirlos."""
+        size = self.size
+        idx = row * size + col
+        self._update_stone_terms(row, col, idx, 1)
+        uf = self._uf
+        uf.add(idx)
+        raices = set()
+        for ni, nj in self._vecinos[row][col]:
+            if (ni * size + nj) in uf:
+                raices.add(uf.find(ni * size + nj))
+                uf.union(idx, ni * size + nj)
+        return len(raices)
+
+    def _update_stone_terms(self, row: int, col: int, idx: int, sign: int):
+        for combo in range(4):
+            self._dir_sums[combo] += sign * self._valores[combo][idx]
+        self._exp_sum += sign * self._grado[idx]
+        # strategic_direction recibe player_id como `opponent_id`: 2 mira columnas, 1 mira filas
+        eje = col if self.player_id == 2 else row
+        if eje == 0:
+            self._edge_counts[0] += sign
+        if eje == self.size - 1:
+            self._edge_counts[1] += sign
+
+    def _bridge_points(self, row: int, col: int) -> int:
+        """Puntos de detectar_puentes para una casilla vacía."""
+        size = self.size
+        uf = self._uf
+        grupos_conectados = set()
+        for ni, nj in self._vecinos[row][col]:
+            if (ni * size + nj) in uf:
+                grupos_conectados.add(uf.find(ni * size + nj))
+        if len(grupos_conectados) < 2:
+            return 0
+        score = 15 * len(grupos_conectados)
+        if (self.player_id == 1 and col in [0, size - 1]) or \
+           (self.player_id == 2 and row in [0, size - 1]):
+            score += 20
+        return score
+
+    def _empty_neighbors(self, row: int, col: int) -> list:
+        board = self.board.board
+        return [(ni, nj) for ni, nj in self._vecinos[row][col] if board[ni][nj] == 0]
+
+    def _group_liberties(self, row: int, col: int) -> set:
+        """Casillas vacías adyacentes al grupo de la ficha en (row, col)."""
+        size = self.size
+        uf = self._uf
+        visitadas = {(row, col)}
+        pendientes = [(row, col)]
+        libertades = set()
+        board = self.board.board
+        while pendientes:
+            i, j = pendientes.pop()
+            for ni, nj in self._vecinos[i][j]:
+                if (ni, nj) in visitadas:
+                    continue
+                if board[ni][nj] == 0:
+                    libertades.add((ni, nj))
+                elif (ni * size + nj) in uf:
+                    visitadas.add((ni, nj))
+                    pendientes.append((ni, nj))
+        return libertades
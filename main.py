@@ -1,11 +1,23 @@
 import os
 from board import HexBoard
 from player import AI_Player
+from mcts_player import MCTS_Player
+from parallel_search import ParallelAI_Player
+from opening_book import DEFAULT_DIR
 
 
 def clear_console():
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def crear_ia(player_id: int, tipo: str, time_limit: float, ponder: bool = False):
+    """Crea el jugador IA elegido: "1" minimax (alfa-beta), "2" Monte Carlo Tree Search o "3" minimax paralelo."""
+    if tipo == "2":
+        return MCTS_Player(player_id, time_limit=time_limit)
+    # Los minimax usan el libro de aperturas de books/ si existe para el tamaño del tablero
+    if tipo == "3":
+        return ParallelAI_Player(player_id, time_limit=time_limit, opening_book=DEFAULT_DIR)
+    return AI_Player(player_id, time_limit=time_limit, ponder=ponder, opening_book=DEFAULT_DIR)
+
 def main():
     print("Bienvenido a HEX")
     try:
@@ -32,6 +44,10 @@ def main():
                 break
             except ValueError:
                 print("Entrada inválida. Use un número positivo. Ejemplo: 3.5")
+        ai_type = input("Tipo de IA (1: Minimax, 2: MCTS, 3: Minimax paralelo) [Predeterminado: 1]: ").strip() or "1"
+        ponder = False
+        if ai_type == "1":
+            ponder = input("¿Pensar durante el turno del oponente? (s/N): ").strip().lower() == "s"
 
 
     if mode == "2":
@@ -39,12 +55,12 @@ def main():
         ai_player = 2 if human_player == 1 else 1
         player_objects = {
             human_player: None,  # Humano: Él hace su propio input
-           ai_player: AI_Player(ai_player, time_limit=time_limit)
+           ai_player: crear_ia(ai_player, ai_type, time_limit, ponder)
         }
     elif mode == "3":
         player_objects = {
-            1: AI_Player(1, time_limit=time_limit),  # IA
-            2: AI_Player(2, time_limit=time_limit)   # IA
+            1: crear_ia(1, ai_type, time_limit, ponder),  # IA
+            2: crear_ia(2, ai_type, time_limit, ponder)   # IA
         }
     else:
         player_objects = {
@@ -52,42 +68,50 @@ def main():
             2: None   # Humano
         }
 
-    current_player = 1
-    while True:
-        clear_console()
-        board.print_board()
+    try:
+        current_player = 1
+        while True:
+            clear_console()
+            board.print_board()
 
-        if board.check_connection(1):
-            print("¡El jugador 1 (🔴) ha ganado!")
-            break
-        if board.check_connection(2):
-            print("¡El jugador 2 (🔵) ha ganado!")
-            break
-        if not board.get_possible_moves():
-            print("Empate. No hay más movimientos disponibles.")
-            break
+            if board.check_connection(1):
+                print("¡El jugador 1 (🔴) ha ganado!")
+                break
+            if board.check_connection(2):
+                print("¡El jugador 2 (🔵) ha ganado!")
+                break
+            if not board.get_possible_moves():
+                print("Empate. No hay más movimientos disponibles.")
+                break
 
-        print(f"\n \n Turno del jugador {current_player} ({'🔴' if current_player==1 else '🔵'}).")
+            print(f"\n \n Turno del jugador {current_player} ({'🔴' if current_player==1 else '🔵'}).")
 
-        if player_objects.get(current_player) is None:
-            # movimiento del humano(por coordenadas)
-            try:
-                move_input = input("Ingrese su movimiento como 'fila columna': ")
-                row, col = map(int, move_input.split())
-            except Exception as e:
-                print("Entrada inválida. Inténtelo de nuevo.")
-                continue
-            if (row, col) not in board.get_possible_moves():
-                print("Movimiento no válido o casilla ocupada. Inténtelo de nuevo.")
-                continue
-            board.place_piece(row, col, current_player)
-        else:
-            move = player_objects[current_player].play(board)
-            print(f"La IA juega en la posición: {move}")
-            board.place_piece(move[0], move[1], current_player)
+            if player_objects.get(current_player) is None:
+                # movimiento del humano(por coordenadas)
+                try:
+                    move_input = input("Ingrese su movimiento como 'fila columna': ")
+                    row, col = map(int, move_input.split())
+                except Exception as e:
+                    print("Entrada inválida. Inténtelo de nuevo.")
+                    continue
+                if (row, col) not in board.get_possible_moves():
+                    print("Movimiento no válido o casilla ocupada. Inténtelo de nuevo.")
+                    continue
+                board.place_piece(row, col, current_player)
+            else:
+                move = player_objects[current_player].play(board)
+                print(f"La IA juega en la posición: {move}")
+                board.place_piece(move[0], move[1], current_player)
 
-        # Cambiar turno
-        current_player = 2 if current_player == 1 else 1
+            # Cambiar turno
+            current_player = 2 if current_player == 1 else 1
+    finally:
+        # Detener el pondering de las IA que lo usen y terminar los pools de procesos (MCTS, minimax paralelo)
+        for player in player_objects.values():
+            if isinstance(player, AI_Player):
+                player.stop_pondering()
+            if hasattr(player, "close"):
+                player.close()
 
 if __name__ == "__main__":
     main()
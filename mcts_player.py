@@ -0,0 +1,220 @@
+#mcts_player.py
+
+import math
+import multiprocessing
+import os
+import random
+import time
+from typing import Tuple
+import numpy as np
+from board import HexBoard
+from father_player import Player
+import heuristics as h
+from geometry import geometria
+import batch_playout as bp
+
+def ganador_tablero_lleno(cells: list, size: int) -> int:
+    """Ganador de un tablero lleno (siempre hay exactamente uno): 1 si conecta izquierda-derecha, si no 2."""
+    vecinos = geometria(size).vecinos
+    pendientes = [i * size for i in range(size) if cells[i * size] == 1]
+    visitadas = set(pendientes)
+    while pendientes:
+        idx = pendientes.pop()
+        if idx % size == size - 1:
+            return 1
+        for n in vecinos[idx]:
+            if n not in visitadas and cells[n] == 1:
+                visitadas.add(n)
+                pendientes.append(n)
+    return 2
+
+
+class _Node:
+    """Nodo del árbol UCT/RAVE. `player` es quien hizo `move` para llegar a este nodo."""
+    __slots__ = ("move", "player", "parent", "children", "untried", "visits", "wins", "amaf_visits", "amaf_wins")
+
+    def __init__(self, move: int, player: int, parent: "_Node | None", untried: list):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+        self.amaf_visits = 0
+        self.amaf_wins = 0.0
+
+
+def _select(node: _Node, exploration: float, rave_k: float) -> _Node:
+    """Hijo con mayor valor UCT mezclando la media real y la AMAF (RAVE)."""
+    log_n = math.log(node.visits)
+    best, best_value = None, float("-inf")
+    for child in node.children:
+        beta = math.sqrt(rave_k / (3 * child.visits + rave_k)) if child.amaf_visits else 0.0
+        q = child.wins / child.visits
+        amaf = child.amaf_wins / child.amaf_visits if child.amaf_visits else 0.0
+        value = (1 - beta) * q + beta * amaf + exploration * math.sqrt(log_n / child.visits)
+        if value > best_value:
+            best, best_value = child, value
+    return best
+
+
+def buscar_mcts(cells: list, size: int, to_move: int, deadline: float, seed: int,
+                exploration: float = 0.7, rave_k: float = 300.0, batch: int = 1) -> tuple[dict, int]:
+    """
+    Ejecuta iteraciones UCT/RAVE desde la posición `cells` (lista plana) hasta `deadline`.
+    Devuelve ({casilla: (visitas, victorias)} de los hijos de la raíz, número de simulaciones).
+    Con `batch` > 1 cada hoja se evalúa con `batch` partidas aleatorias vectorizadas (batch_playout)
+    y cuenta como `batch` visitas.
+    Se ejecuta tal cual en cada proceso del pool (paralelismo de raíz).
+    """
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    vacias = [i for i, c in enumerate(cells) if c == 0]
+    root = _Node(-1, 3 - to_move, None, vacias[:])
+    rng.shuffle(root.untried)
+    simulaciones = 0
+
+    while time.time() < deadline:
+        estado = cells[:]
+        node = root
+        player = to_move
+
+        # 1. Selección
+        while not node.untried and node.children:
+            node = _select(node, exploration, rave_k)
+            estado[node.move] = node.player
+            player = 3 - node.player
+
+        # 2. Expansión
+        if node.untried:
+            move = node.untried.pop()
+            estado[move] = player
+            hijas = [i for i in node.untried] + [c.move for c in node.children]
+            rng.shuffle(hijas)
+            child = _Node(move, player, node, hijas)
+            node.children.append(child)
+            node = child
+            player = 3 - player
+
+        if batch > 1:
+            _simular_lote(node, estado, size, player, batch, np_rng)
+            simulaciones += batch
+            continue
+
+        # 3. Simulación: rellenar al azar las casillas restantes alternando jugadores
+        restantes = [i for i, c in enumerate(estado) if c == 0]
+        rng.shuffle(restantes)
+        for k, idx in enumerate(restantes):
+            estado[idx] = player if k % 2 == 0 else 3 - player
+        winner = ganador_tablero_lleno(estado, size)
+
+        # 4. Retropropagación (resultado y estadísticas AMAF de los hermanos)
+        while node is not None:
+            node.visits += 1
+            if node.player == winner:
+                node.wins += 1
+            parent = node.parent
+            if parent is not None:
+                for sibling in parent.children:
+                    if estado[sibling.move] == sibling.player:
+                        sibling.amaf_visits += 1
+                        if sibling.player == winner:
+                            sibling.amaf_wins += 1
+            node = parent
+        simulaciones += 1
+
+    return {child.move: (child.visits, child.wins) for child in root.children}, simulaciones
+
+
+def _simular_lote(node: _Node, estado: list, size: int, player: int, batch: int, rng: np.random.Generator):
+    """Simulación y retropropagación de `batch` partidas aleatorias desde la hoja `node` (le toca a `player`)."""
+    tablero = np.array(estado, dtype=np.int8).reshape(size, size)
+    llenos, winners = bp.simular(tablero, player, batch, rng)
+    llenos = llenos.reshape(batch, size * size)
+    victorias = {p: int(np.count_nonzero(winners == p)) for p in (1, 2)}
+    while node is not None:
+        node.visits += batch
+        node.wins += victorias[node.player]
+        parent = node.parent
+        if parent is not None:
+            moves = np.array([sibling.move for sibling in parent.children])
+            players = np.array([sibling.player for sibling in parent.children])
+            jugadas = llenos[:, moves] == players               # (batch, hermanos)
+            ganadas = jugadas & (winners[:, np.newaxis] == players)
+            for sibling, n, w in zip(parent.children, jugadas.sum(axis=0), ganadas.sum(axis=0)):
+                sibling.amaf_visits += int(n)
+                sibling.amaf_wins += int(w)
+        node = parent
+
+
+def _buscar_mcts_args(args: tuple) -> tuple[dict, int]:
+    return buscar_mcts(*args)
+
+
+class MCTS_Player(Player):
+    """
+    Jugador Monte Carlo Tree Search (UCT con RAVE). Con `workers` > 1 cada proceso del pool
+    construye su propio árbol durante `time_limit` segundos y se suman las visitas de la raíz.
+    """
+
+    def __init__(self, player_id: int, time_limit: float = 5.0, workers: int | None = None,
+                 exploration: float = 0.7, rave_k: float = 300.0, seed: int | None = None, batch: int = 1):
+        super().__init__(player_id)
+        self.opponent_id = 3 - player_id
+        self.time_limit = time_limit
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.exploration = exploration
+        self.rave_k = rave_k
+        self.batch = batch  # Partidas aleatorias por hoja (> 1: simulación vectorizada con batch_playout)
+        self.rng = random.Random(seed)
+        self.last_simulations = 0
+        self._pool = None
+
+    def play(self, board: HexBoard) -> Tuple[int, int]:
+        start = time.time()
+        if not board.get_possible_moves():
+            return (-1, -1)
+
+        # Ganar de inmediato o bloquear la única amenaza del oponente
+        ganadoras, _ = h.detectar_amenazas(board, self.player_id)
+        if ganadoras:
+            return ganadoras[0]
+        threat_status, block_move = h.detect_and_block_imminent_win(board, self.player_id)
+        if threat_status == 0:
+            return block_move
+
+        size = board.size
+        cells = [cell for row in board.board for cell in row]
+        # Margen para el arranque de los procesos y la combinación de resultados
+        deadline = start + self.time_limit * 0.9
+        seeds = [self.rng.getrandbits(32) for _ in range(self.workers)]
+        args = [(cells, size, self.player_id, deadline, seed, self.exploration, self.rave_k, self.batch)
+                for seed in seeds]
+
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(self.workers)
+            resultados = self._pool.map(_buscar_mcts_args, args)
+        else:
+            resultados = [buscar_mcts(*args[0])]
+
+        visitas = {}
+        self.last_simulations = 0
+        for raiz, simulaciones in resultados:
+            self.last_simulations += simulaciones
+            for move, (n, w) in raiz.items():
+                total_n, total_w = visitas.get(move, (0, 0.0))
+                visitas[move] = (total_n + n, total_w + w)
+
+        if not visitas:
+            return board.get_possible_moves()[0]
+        # Más visitas; en empate, mayor tasa de victorias y luego menor índice (determinista)
+        best = max(visitas, key=lambda m: (visitas[m][0], visitas[m][1] / max(visitas[m][0], 1), -m))
+        return divmod(best, size)
+
+    def close(self):
+        """Termina el pool de procesos (si se creó)."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
@@ -0,0 +1,130 @@
+#opening_book.py
+
+import argparse
+import logging
+import mmap
+import multiprocessing
+import os
+import struct
+from board import HexBoard
+from transposition import SIDE_KEY
+import heuristics as h
+
+# Formato del libro: cabecera + registros ordenados por clave
+#   cabecera: magia (4s), versión (H), tamaño del tablero (H), número de registros (I), reservado (I)
+#   registro: clave de la posición (Q, ver clave_libro), casilla fila * N + columna (H), profundidad alcanzada (H)
+MAGIC = b"HEXB"
+VERSION = 2  # 2: las claves incluyen el jugador al turno
+HEADER = struct.Struct("<4sHHII")
+RECORD = struct.Struct("<QHH")
+
+DEFAULT_DIR = "books"
+
+logger = logging.getLogger(__name__)
+
+
+def ruta_libro(directorio: str, size: int) -> str:
+    return os.path.join(directorio, f"hex_{size}.book")
+
+
+def clave_libro(board_hash: int, to_move: int) -> int:
+    """Clave de una posición en el libro: su hash de Zobrist, distinto según a quién le toque mover (como en la TT)."""
+    return board_hash ^ SIDE_KEY if to_move == 2 else board_hash
+
+
+class OpeningBook:
+    """Libro de aperturas de solo lectura, mapeado en memoria con mmap y consultado por búsqueda binaria."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.count, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} no es un libro de aperturas válido")
+
+    def lookup(self, key: int) -> tuple[int, int] | None:
+        """Movimiento del libro para la posición con clave `key` (ver clave_libro), o None si no está."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record_key, move, _ = RECORD.unpack_from(self._mm, HEADER.size + mid * RECORD.size)
+            if record_key < key:
+                lo = mid + 1
+            elif record_key > key:
+                hi = mid
+            else:
+                return divmod(move, self.size)
+        return None
+
+    def close(self):
+        self._mm.close()
+
+
+def guardar_libro(path: str, size: int, entries: dict[int, tuple[tuple[int, int], int]]):
+    """Escribe {clave: (movimiento, profundidad)} en formato binario ordenado."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, len(entries), 0))
+        for key in sorted(entries):
+            (row, col), depth = entries[key]
+            f.write(RECORD.pack(key, row * size + col, depth))
+
+
+def _analizar(args: tuple) -> tuple[int, tuple[int, int], int, list]:
+    """Busca el mejor movimiento de una posición y devuelve también las jugadas candidatas a expandir."""
+    from player import AI_Player  # Import diferido: el módulo se usa también solo para leer libros
+    size, stones, to_move, time_limit, branch = args
+    board = HexBoard(size)
+    for row, col, player_id in stones:
+        board.place_piece(row, col, player_id)
+
+    ai = AI_Player(to_move, time_limit=time_limit)
+    ai.first_move = False  # Buscar también la primera jugada en lugar de elegir_apertura
+    move, stats = ai.play_with_stats(board)
+
+    ds = h.obtener_disjointsets(board, to_move)
+    candidatas = sorted(h.evaluar_movimientos(to_move, 3 - to_move, board, ds), key=lambda x: -x[1])
+    expandir = [move] + [m for m, _ in candidatas if m != move][:max(branch - 1, 0)]
+    return clave_libro(board.hash, to_move), move, stats.depth, expandir
+
+
+def generar_libro(size: int, plies: int, time_limit: float, branch: int, workers: int | None = None) -> dict:
+    """
+    Analiza las posiciones de las primeras `plies` jugadas: desde el tablero vacío se expande, en cada
+    posición, el mejor movimiento y las `branch - 1` siguientes candidatas según la heurística.
+    """
+    entries = {}
+    frontier = [[]]
+    with multiprocessing.Pool(workers) as pool:
+        for ply in range(plies):
+            to_move = 1 if ply % 2 == 0 else 2
+            tasks = [(size, stones, to_move, time_limit, branch) for stones in frontier]
+            siguiente = []
+            for stones, (key, move, depth, expandir) in zip(frontier, pool.map(_analizar, tasks, chunksize=1)):
+                entries[key] = (move, depth)
+                siguiente.extend(stones + [(m[0], m[1], to_move)] for m in expandir)
+            frontier = siguiente
+            logger.info("Jugada %d: %d posiciones analizadas", ply + 1, len(tasks))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un libro de aperturas de Hex con búsquedas profundas.")
+    parser.add_argument("--size", type=int, required=True, help="Tamaño del tablero")
+    parser.add_argument("--plies", type=int, default=3, help="Número de jugadas iniciales cubiertas")
+    parser.add_argument("--branch", type=int, default=6, help="Jugadas expandidas por posición")
+    parser.add_argument("--time", type=float, default=10.0, help="Segundos de búsqueda por posición")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--out", default=None, help=f"Fichero de salida (por defecto {DEFAULT_DIR}/hex_N.book)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")  # Progreso de generar_libro
+
+    entries = generar_libro(args.size, args.plies, args.time, args.branch, args.workers)
+    path = args.out or ruta_libro(DEFAULT_DIR, args.size)
+    guardar_libro(path, args.size, entries)
+    print(f"{len(entries)} posiciones guardadas en {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#parallel_search.py
+
+import math
+import multiprocessing
+import os
+import struct
+import time
+import numpy as np
+from board import HexBoard
+from player import AI_Player
+from unionfind import UnionFind
+from incremental_eval import IncrementalEvaluator
+from search_stats import SearchStats
+import heuristics as h
+
+# Cada ranura de la tabla compartida ocupa tres enteros de 64 bits: (comprobación, valor, metadatos)
+SLOT_BYTES = 24
+_VALIDA = 1 << 63
+
+# Margen bajo el alfa compartido: los movimientos que empatan con el mejor se siguen calculando
+# de forma exacta, así el desempate por orden no depende de qué proceso terminó antes
+ALPHA_MARGIN = 1e-6
+# Tope del alfa compartido: las victorias forzadas (inf) también se obtienen exactas
+ALPHA_CAP = 1e300
+
+
+class SharedTranspositionTable:
+    """
+    Tabla de transposición en memoria compartida (multiprocessing.RawArray) con la misma interfaz
+    que transposition.TranspositionTable. Sin bloqueos: cada ranura guarda clave ^ valor ^ metadatos,
+    así una escritura a medias entre procesos se detecta en `probe` y se descarta.
+    """
+
+    def __init__(self, max_mb: float = 16.0, raw=None):
+        if raw is None:
+            raw = multiprocessing.RawArray("Q", 3 * max(1, int(max_mb * 1024 * 1024) // SLOT_BYTES))
+        self.raw = raw
+        self._data = np.frombuffer(raw, dtype=np.uint64).reshape(-1, 3)
+        self.capacity = len(self._data)
+        self.generation = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self._data[:] = 0
+
+    def probe(self, key: int) -> tuple | None:
+        check, bits, meta = self._data[key % self.capacity].tolist()
+        if not meta & _VALIDA or check ^ bits ^ meta != key:
+            return None
+        move = meta & 0x1FFFFFFF
+        return ((meta >> 31) & 0xFFFF, struct.unpack("<d", struct.pack("<Q", bits))[0],
+                (meta >> 29) & 0x3, divmod(move - 1, 1 << 14) if move else None)
+
+    def store(self, key: int, depth: int, value: float, flag: int, best_move: tuple | None):
+        index = key % self.capacity
+        check, bits, meta = self._data[index].tolist()
+        if meta & _VALIDA:
+            same_key = check ^ bits ^ meta == key
+            generation = (meta >> 47) & 0xFFFF
+            if not same_key and generation == self.generation & 0xFFFF and (meta >> 31) & 0xFFFF > depth:
+                return  # Conservar la entrada más profunda de la búsqueda actual
+            if same_key and best_move is None and meta & 0x1FFFFFFF:
+                best_move = divmod((meta & 0x1FFFFFFF) - 1, 1 << 14)
+        move = (best_move[0] << 14 | best_move[1]) + 1 if best_move is not None else 0
+        meta = _VALIDA | (self.generation & 0xFFFF) << 47 | (depth & 0xFFFF) << 31 | flag << 29 | move
+        bits = struct.unpack("<Q", struct.pack("<d", value))[0]
+        self._data[index] = (key ^ bits ^ meta, bits, meta)
+
+
+# Estado de cada proceso del pool (se fija en _init_worker)
+_TABLA = None
+_ALPHA = None
+# Búsqueda de la jugada en curso en este proceso: (clave, jugador, tablero, UnionFind del jugador y del
+# oponente). Se reutiliza en todas las iteraciones de la misma jugada.
+_BUSQUEDA = None
+
+
+def _init_worker(raw, alpha):
+    global _TABLA, _ALPHA
+    _TABLA = SharedTranspositionTable(raw=raw)
+    _ALPHA = alpha
+
+
+def _preparar(cells: list, size: int, player_id: int, deadline: float, generation: int, raiz: dict,
+              timers: bool, window: int | None, window_min_size: int) -> tuple:
+    """
+    Tablero, UnionFind y AI_Player de la jugada: se construyen en la primera tarea de la jugada y se
+    conservan en las siguientes iteraciones. El orden de la raíz y las casillas excluidas llegan ya
+    calculados por el proceso principal (`raiz`).
+    """
+    global _BUSQUEDA
+    clave = (generation, player_id, tuple(cells))
+    if _BUSQUEDA is not None and _BUSQUEDA[0] == clave:
+        return _BUSQUEDA[1:]
+    board = HexBoard(size)
+    for idx, cell in enumerate(cells):
+        if cell:
+            board.place_piece(idx // size, idx % size, cell)
+
+    player = AI_Player(player_id, time_limit=max(deadline - time.time(), 0.0), tt_mb=0, stats_timers=timers,
+                       window=window, window_min_size=window_min_size)
+    player.tt = _TABLA
+    player.tt.generation = generation
+    player.start_time = deadline - player.time_limit
+    player._deadline = deadline
+    player._excluidas = raiz["excluidas"]
+    player._disco = raiz["disco"]
+    player.prepare_ordering(board, raiz["orden"])
+    player._evaluator = IncrementalEvaluator(board, player_id)
+    board.attach(player._evaluator)
+    ds_jugador = h.obtener_disjointsets(board, player_id)
+    ds_oponente = h.obtener_disjointsets(board, 3 - player_id)
+    _BUSQUEDA = (clave, player, board, ds_jugador, ds_oponente)
+    return _BUSQUEDA[1:]
+
+
+def _buscar_raiz(args: tuple) -> tuple[list, bool, SearchStats]:
+    """
+    Busca a profundidad `depth` los movimientos de raíz asignados a este proceso.
+    Devuelve ([(índice, movimiento, valor, exacto)], completado, estadísticas de esta tarea).
+    """
+    cells, size, player_id, depth, moves, deadline, generation, raiz, timers, window, window_min_size = args
+    player, board, ds_jugador, ds_oponente = _preparar(cells, size, player_id, deadline, generation, raiz,
+                                                       timers, window, window_min_size)
+    player.stats = SearchStats(timers)
+    player._root_depth = depth  # La raíz no se visita aquí: los hijos pueden usar cortes de la tabla
+
+    results = []
+    local_alpha = float('-inf')
+    for index, move in moves:
+        alpha_used = min(max(local_alpha, _ALPHA.value) - ALPHA_MARGIN, ALPHA_CAP)
+        board.make_move(move[0], move[1], player_id)
+        mark = h.conectar_ficha(board, ds_jugador, move, player_id)
+        player._path.append(move)
+        try:
+            value = player.minimax_time(board, depth - 1, False, alpha_used, float('inf'), ds_jugador, ds_oponente, [])
+        except TimeoutError:
+            return results, False, player.stats
+        finally:
+            player._path.pop()
+            ds_jugador.rollback(mark)
+            board.undo_move()
+
+        exact = value > alpha_used  # Si no, es solo una cota superior
+        results.append((index, move, value, exact))
+        if exact and value > local_alpha:
+            local_alpha = value
+            with _ALPHA.get_lock():
+                if value > _ALPHA.value:
+                    _ALPHA.value = value
+    return results, True, player.stats
+
+
+class ParallelAI_Player(AI_Player):
+    """
+    AI_Player que reparte los movimientos de la raíz de cada iteración entre `workers` procesos.
+    Los procesos comparten el alfa de la raíz (multiprocessing.Value) y una tabla de transposición
+    en memoria compartida. El resultado de cada profundidad completada se combina de forma
+    determinista: mayor valor exacto y, en empate, el primero en el orden de la raíz.
+    No admite pondering (cada profundidad bloquea hasta que el pool termina).
+    """
+
+    def __init__(self, player_id: int, max_depth: int = 100, time_limit: float = 5.0, tt_mb: float = 16.0,
+                 seed: int | None = None, workers: int | None = None, opening_book: str | None = None,
+                 game_time: float | None = None, window: int | None = 2, window_min_size: int = 15):
+        # tt_mb=0: la tabla propia de AI_Player no se usa, se sustituye por la compartida
+        super().__init__(player_id, max_depth, time_limit, 0, seed, opening_book=opening_book, game_time=game_time,
+                         window=window, window_min_size=window_min_size)
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.tt = SharedTranspositionTable(tt_mb)
+        self._alpha = multiprocessing.Value('d', float('-inf'))
+        self._pool = None
+
+    def iterative_deepening(self, board: HexBoard, ds_jugador: UnionFind, ds_oponente: UnionFind, ordered_moves: list,
+                            start_depth: int = 1) -> int:
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers, initializer=_init_worker, initargs=(self.tt.raw, self._alpha))
+
+        size = board.size
+        cells = [cell for row in board.board for cell in row]
+        deadline = self._deadline
+        root_moves = [m[0] for m in ordered_moves]
+        # Análisis de la raíz hecho una sola vez aquí (candidate_moves y order_moves) y compartido con los procesos
+        raiz = {"orden": ordered_moves, "excluidas": self._excluidas, "disco": self._disco}
+        if self.best_move in root_moves:
+            root_moves.remove(self.best_move)
+            root_moves.insert(0, self.best_move)
+
+        depth = start_depth
+        while depth <= self.max_depth and time.time() < deadline:
+            self._alpha.value = float('-inf')
+            indexed = list(enumerate(root_moves))
+            # Reparto fijo por posición en el orden de la raíz (independiente de los tiempos)
+            tasks = [(cells, size, self.player_id, depth, indexed[i::self.workers], deadline, self.tt.generation, raiz,
+                      self.stats_timers, self.window, self.window_min_size)
+                     for i in range(min(self.workers, len(indexed)))]
+            partial = self._pool.map(_buscar_raiz, tasks, chunksize=1)
+
+            results = [r for rs, _, _ in partial for r in rs]
+            for _, _, worker_stats in partial:
+                self.stats.merge(worker_stats)
+            if not all(done for _, done, _ in partial) or len(results) < len(root_moves):
+                self.stats.timed_out = True
+                break  # Iteración incompleta: se conserva el resultado de la anterior
+
+            exact = [r for r in results if r[3]]
+            index, move, _, _ = max(exact, key=lambda r: (r[2], -r[0])) if exact else min(results)
+            self.best_move = move
+            # El mejor movimiento encabeza el orden de la siguiente iteración
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            depth += 1
+            # Victoria demostrada, o derrota con todas las jugadas (una cota superior -inf también es exacta):
+            # más profundidad no cambia el resultado
+            if any(r[2] == math.inf for r in exact) or all(r[2] == -math.inf for r in results):
+                break
+        return depth - 1
+
+    def close(self):
+        """Termina el pool de procesos (si se creó)."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
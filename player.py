@@ -1,157 +1,509 @@
 #player.py
 
-from scipy.cluster.hierarchy import DisjointSet
+from unionfind import UnionFind
 from board import HexBoard
 from typing import Tuple
+import json
+import logging
+import math
+import os
+import random
+import threading
 import time
 from father_player import Player
 import heuristics as h
+import vc_analysis as vc
+from incremental_eval import IncrementalEvaluator
+from transposition import TranspositionTable, EXACT, LOWER, UPPER, SIDE_KEY
+from opening_book import OpeningBook, ruta_libro, clave_libro
+from search_stats import SearchStats
+from time_manager import TimeManager
+from geometry import disco_hex
+
+logger = logging.getLogger(__name__)
+
+# Ventana de aspiración inicial alrededor del valor de la iteración anterior (se multiplica si falla)
+ASPIRATION_WINDOW = 2.0
+ASPIRATION_GROWTH = 4.0
+ASPIRATION_MAX = 128.0
+# Anchura de la ventana nula de PVS (los valores de evaluate_board son reales)
+PVS_EPSILON = 1e-9
 
 class AI_Player(Player):
-    def __init__(self, player_id: int, max_depth: int = 100, time_limit: float = 5.0):
+    def __init__(self, player_id: int, max_depth: int = 100, time_limit: float = 5.0, tt_mb: float = 16.0,
+                 seed: int | None = None, ponder: bool = False, opening_book: str | None = None,
+                 stats_timers: bool = False, log_stats: bool = False, game_time: float | None = None,
+                 window: int | None = 2, window_min_size: int = 15, max_nodes: int | None = None):
         super().__init__(player_id)
         self.opponent_id = 3 - player_id  # Si eres 1, el oponente es 2; si eres 2, el oponente es 1
         self.max_depth = max_depth
         self.first_move = True
         self.start_time = 0 
-        self.time_limit = time_limit
+        self.time_limit = time_limit  # Con `game_time`, máximo por jugada
+        self.time_manager = TimeManager(game_time)
+        self.max_nodes = max_nodes  # Presupuesto de nodos por jugada (None: solo tiempo)
         self.best_move = None
+        self.tt = TranspositionTable(tt_mb)  # Se conserva entre jugadas e iteraciones
+        self._root_depth = 0
+        self._evaluator = None
+        self.rng = random.Random(seed)  # Elecciones aleatorias (apertura) reproducibles con `seed`
+        self._deadline = 0.0
+        # Pondering: búsqueda en segundo plano durante el turno del oponente
+        self.ponder = ponder
+        self._ponder_thread = None
+        self._stop = False            # Pide a la búsqueda en curso que termine (TimeoutError)
+        self._ponder_result = None    # (hash de la posición, mejor movimiento, profundidad completada)
+        # Libro de aperturas: fichero .book o directorio con hex_N.book por tamaño (ver opening_book.py)
+        self.opening_book = opening_book
+        self._books = {}
+        # Estadísticas: `stats` es la de la búsqueda en curso y `last_stats` la de la última jugada devuelta
+        self.stats_timers = stats_timers  # True mide los segundos por fase de cada jugada (desactivado al jugar)
+        self.log_stats = log_stats        # Registrar cada jugada como JSON con logging (logger "player")
+        self.stats = SearchStats(stats_timers)
+        self.last_stats = self.stats
+        # Ordenación dinámica (ver prepare_ordering): orden base de la raíz, jugadas killer por ply
+        # e historial de cortes por casilla y jugador
+        self._root_order = []
+        self._killers = []
+        self._history = {1: [], 2: []}
+        # Ventana de candidatas en tableros grandes: casillas a distancia <= window de las fichas
+        # (None la desactiva). En la búsqueda se amplía con el entorno de las fichas jugadas desde la raíz.
+        self.window = window
+        self.window_min_size = window_min_size
+        self._disco = []        # Desplazamientos del entorno (vacío si no se usa ventana)
+        self._excluidas = set()  # Casillas muertas o capturadas en la raíz
+        self._root_set = set()
+        self._path = []         # Jugadas desde la raíz en la rama actual
 
     def play(self, board: HexBoard) -> Tuple[int, int]:
         """
         Método principal que el framework llamará para obtener el movimiento del jugador AI.
         Usa minimax hasta una profundidad determinada.
         """
+        return self.play_with_stats(board)[0]
+
+    def play_with_stats(self, board: HexBoard) -> tuple[Tuple[int, int], SearchStats]:
+        """Como `play`, pero devuelve también las estadísticas de la búsqueda."""
+        self.stop_pondering()
+        move = self.choose_move(board)
+        stats = self.stats
+        stats.elapsed = time.time() - self.start_time
+        self.time_manager.consume(stats.elapsed)
+        self.last_stats = stats
+        if self.log_stats:
+            logger.info(json.dumps({"player": self.player_id, "move": list(move), **stats.as_dict()}))
+        if self.ponder and move != (-1, -1):
+            self.start_pondering(board, move)
+        return move, stats
+
+    def choose_move(self, board: HexBoard) -> Tuple[int, int]:
+        """Busca el movimiento para la posición actual dentro de `time_limit`."""
         self.start_time = time.time()
+        self._deadline = self.start_time + self.time_limit
         self.best_move = None  # Reiniciar en cada llamada
+        self.tt.new_search()
+        stats = self.stats = SearchStats(self.stats_timers)
+
+        # Mientras la posición esté en el libro se responde sin buscar
+        with stats.phase("libro"):
+            book_move = self.book_move(board)
+        if book_move is not None:
+            self.first_move = False
+            stats.source = "libro"
+            return book_move
 
         if self.first_move and h.es_tablero_vacio(self.player_id ,board):
             self.first_move = False
-            return h.elegir_apertura(self.player_id, board, board.size)
+            stats.source = "apertura"
+            return h.elegir_apertura(self.player_id, board, board.size, self.rng)
 
         possible_moves = board.get_possible_moves()
         if not possible_moves:
             return (-1, -1) 
 
-        # Precalcular DisjointSets para jugador y oponente
-        ds_jugador = h.obtener_disjointsets(board, self.player_id)
-        ds_oponente = h.obtener_disjointsets(board, self.opponent_id)
+        # Precalcular los UnionFind de jugador y oponente
+        with stats.phase("disjointsets"):
+            ds_jugador = h.obtener_disjointsets(board, self.player_id)
+            ds_oponente = h.obtener_disjointsets(board, self.opponent_id)
         
         # Verificar amenazas inmediatas
-        threat_status, block_move = h.detect_and_block_imminent_win(board, self.player_id)
+        with stats.phase("amenazas"):
+            threat_status, block_move = h.detect_and_block_imminent_win(board, self.player_id)
         if threat_status == 0 or threat_status == -1:
+            stats.source = "amenaza"
             return block_move
 
+        # Si el pondering acertó la posición, retomar desde la profundidad que alcanzó
+        start_depth = 1
+        if self._ponder_result is not None and self._ponder_result[0] == board.hash and self._ponder_result[1]:
+            _, self.best_move, pondered_depth = self._ponder_result
+            start_depth = pondered_depth + 1
+        self._ponder_result = None
+
+        # Tiempo de esta jugada según el reparto del tiempo de partida
+        with stats.phase("tiempo"):
+            self._deadline = self.start_time + self.time_manager.budget(board, self.player_id, self.time_limit)
+
         # Búsqueda iterativa con ordenamiento previo
-        depth = 1
-        ordered_moves = self.order_moves(board, possible_moves, ds_jugador)  # Ordenar movimientos iniciales
-        while depth <= self.max_depth:
+        with stats.phase("ordenacion"):
+            candidates = self.candidate_moves(board, ds_jugador, ds_oponente)
+            ordered_moves = self.order_moves(board, candidates, ds_jugador)  # Ordenar movimientos iniciales
+        stats.source = "busqueda"
+        with stats.phase("busqueda"):
+            stats.depth = self.iterative_deepening(board, ds_jugador, ds_oponente, ordered_moves, start_depth)
+
+        return self.best_move if self.best_move else ordered_moves[0][0]
+
+    def book_move(self, board: HexBoard) -> Tuple[int, int] | None:
+        """Movimiento del libro de aperturas para la posición actual, o None si no hay libro o no está en él."""
+        if self.opening_book is None:
+            return None
+        if board.size not in self._books:
+            path = self.opening_book
+            if os.path.isdir(path):
+                path = ruta_libro(path, board.size)
             try:
-                self.minimax_time(board, depth, True, float('-inf'), float('inf'), ds_jugador, ds_oponente, ordered_moves)
+                book = OpeningBook(path) if os.path.isfile(path) else None
+            except ValueError as e:  # Libro de otra versión del formato: se regenera con opening_book.py
+                logger.warning("%s", e)
+                book = None
+            if book is not None and book.size != board.size:
+                book.close()
+                book = None
+            self._books[board.size] = book
+        book = self._books[board.size]
+        if book is None:
+            return None
+        move = book.lookup(clave_libro(board.hash, self.player_id))
+        # Una colisión de hash podría devolver una casilla ocupada
+        if move is None or board.board[move[0]][move[1]] != 0:
+            return None
+        return move
+
+    def start_pondering(self, board: HexBoard, move: tuple):
+        """Lanza en un hilo la búsqueda de la posición tras `move` y la respuesta más probable del oponente."""
+        self._stop = False
+        self._ponder_thread = threading.Thread(target=self._ponder, args=(board.clone(), move), daemon=True)
+        self._ponder_thread.start()
+
+    def stop_pondering(self):
+        """Detiene el pondering en curso; su resultado queda disponible para la siguiente jugada."""
+        if self._ponder_thread is not None:
+            self._stop = True
+            self._ponder_thread.join()
+            self._ponder_thread = None
+            self._stop = False
+
+    def _ponder(self, board: HexBoard, move: tuple):
+        board.place_piece(move[0], move[1], self.player_id)
+        if board.check_connection(self.player_id) or not board.get_possible_moves():
+            return
+
+        # Respuesta prevista: la de la tabla de transposición o, si no hay, la mejor según la heurística
+        entry = self.tt.probe(board.hash ^ SIDE_KEY)
+        if entry is not None and entry[3] is not None and board.board[entry[3][0]][entry[3][1]] == 0:
+            reply = entry[3]
+        else:
+            ds_rival = h.obtener_disjointsets(board, self.opponent_id)
+            reply = max(h.evaluar_movimientos(self.opponent_id, self.player_id, board, ds_rival), key=lambda x: x[1])[0]
+        board.place_piece(reply[0], reply[1], self.opponent_id)
+        if board.check_connection(self.opponent_id) or not board.get_possible_moves():
+            return
+
+        self.start_time = time.time()
+        self._deadline = float('inf')  # Solo se detiene con stop_pondering
+        self.stats = SearchStats(self.stats_timers)
+        self.best_move = None
+        self.tt.new_search()
+        ds_jugador = h.obtener_disjointsets(board, self.player_id)
+        ds_oponente = h.obtener_disjointsets(board, self.opponent_id)
+        ordered_moves = self.order_moves(board, self.candidate_moves(board, ds_jugador, ds_oponente), ds_jugador)
+        depth = self.iterative_deepening(board, ds_jugador, ds_oponente, ordered_moves)
+        self._ponder_result = (board.hash, self.best_move, depth)
+
+    def iterative_deepening(self, board: HexBoard, ds_jugador: UnionFind, ds_oponente: UnionFind, ordered_moves: list,
+                            start_depth: int = 1) -> int:
+        """
+        Aumenta la profundidad hasta agotar el tiempo; deja en self.best_move el mejor movimiento encontrado
+        (también el mejor de una iteración interrumpida, si superó al de la anterior).
+        Cada iteración usa una ventana de aspiración alrededor del valor de la anterior y no se empieza
+        si la predicción de su duración no cabe en el tiempo restante.
+        Termina en cuanto el valor es ±inf (resultado demostrado). Devuelve la última profundidad completada.
+        """
+        depth = start_depth
+        score = None  # Valor de la última iteración completada
+        iteration_times = []
+        budget = self._deadline - self.start_time
+        self.prepare_ordering(board, ordered_moves)
+        # Evaluador incremental adjunto al tablero mientras dura la búsqueda
+        self._evaluator = IncrementalEvaluator(board, self.player_id)
+        board.attach(self._evaluator)
+        try:
+            while depth <= self.max_depth:
+                if not math.isinf(budget) and not TimeManager.next_iteration_fits(
+                        iteration_times, time.time() - self.start_time, budget):
+                    break  # La siguiente profundidad no terminaría a tiempo
+                iteration_start = time.time()
+                self._root_depth = depth
+                try:
+                    score = self._aspiration_search(board, depth, score, ds_jugador, ds_oponente, ordered_moves)
+                except TimeoutError:
+                    self.stats.timed_out = True
+                    break  # Tiempo agotado
+                self.stats.score = score
+                # La entrada de la raíz guarda el mejor movimiento de la iteración completada
+                entry = self.tt.probe(board.hash)
+                if entry is not None and entry[3] is not None:
+                    self.best_move = entry[3]
+                iteration_times.append(time.time() - iteration_start)
                 depth += 1
-            except TimeoutError:
-                break  # Tiempo agotado
+                if math.isinf(score):
+                    break  # Victoria o derrota demostrada: más profundidad no cambia el resultado
+        finally:
+            board.detach(self._evaluator)
+        return depth - 1
 
-        return self.best_move if self.best_move else ordered_moves[0][0]
+    def _aspiration_search(self, board: HexBoard, depth: int, score: float | None,
+                           ds_jugador: UnionFind, ds_oponente: UnionFind, ordered_moves: list) -> float:
+        """Busca la raíz con una ventana alrededor de `score`, ensanchándola por el lado que falle."""
+        if score is None or math.isinf(score):
+            return self.minimax_time(board, depth, True, float('-inf'), float('inf'), ds_jugador, ds_oponente, ordered_moves)
+        low = high = ASPIRATION_WINDOW
+        while True:
+            alpha = score - low if low <= ASPIRATION_MAX else float('-inf')
+            beta = score + high if high <= ASPIRATION_MAX else float('inf')
+            value = self.minimax_time(board, depth, True, alpha, beta, ds_jugador, ds_oponente, ordered_moves)
+            if value <= alpha and not math.isinf(alpha):
+                low *= ASPIRATION_GROWTH
+            elif value >= beta and not math.isinf(beta):
+                high *= ASPIRATION_GROWTH
+            else:
+                return value
+            self.stats.researches += 1
+
+    def prepare_ordering(self, board: HexBoard, ordered_moves: list):
+        """
+        Inicializa la ordenación dinámica de una búsqueda: el orden heurístico de la raíz sirve de base
+        en todos los nodos, las killers se vacían y el historial de la búsqueda anterior se reduce a la mitad.
+        """
+        self._root_order = [m[0] for m in ordered_moves]
+        self._root_set = set(self._root_order)
+        self._path = []
+        self._killers = [[None, None] for _ in range(self.max_depth + 1)]
+        cells = board.size * board.size
+        for player_id in (1, 2):
+            history = self._history[player_id]
+            self._history[player_id] = [v >> 1 for v in history] if len(history) == cells else [0] * cells
+
+    def sorted_moves(self, board: HexBoard, ply: int, mover: int, first: tuple | None) -> list:
+        """
+        Jugadas de un nodo interior: `first` (movimiento de la tabla de transposición, es decir, la variante
+        principal de la iteración anterior), luego las killers del ply y el resto por historial; los empates
+        conservan el orden heurístico de la raíz (sort es estable).
+        """
+        cells = board.board
+        size = board.size
+        history = self._history[mover]
+        moves = [m for m in self._root_order if cells[m[0]][m[1]] == 0]
+        if self._disco and self._path:
+            # Con ventana: también el entorno de las fichas jugadas desde la raíz
+            nuevas = set()
+            for row, col in self._path:
+                for di, dj in self._disco:
+                    m = (row + di, col + dj)
+                    if 0 <= m[0] < size and 0 <= m[1] < size and cells[m[0]][m[1]] == 0 \
+                            and m not in self._root_set and m not in self._excluidas:
+                        nuevas.add(m)
+            moves.extend(sorted(nuevas))
+        moves.sort(key=lambda m: history[m[0] * size + m[1]], reverse=True)
+        for move in reversed([first] + self._killers[ply]):
+            if move is not None and cells[move[0]][move[1]] == 0 and move in moves:
+                moves.remove(move)
+                moves.insert(0, move)
+        return moves
+
+    def candidate_moves(self, board: HexBoard, ds_jugador: UnionFind, ds_oponente: UnionFind) -> list:
+        """
+        Casillas vacías sin las muertas ni las capturadas (vc_analysis.celdas_inferiores). Se excluyen
+        en todo el árbol (`_excluidas`): nadie juega en ellas, así que un par capturado nunca se invade.
+        """
+        possible_moves = board.get_possible_moves()
+        with self.stats.phase("inferiores"):
+            muertas, capturadas = vc.celdas_inferiores(
+                board, {self.player_id: ds_jugador, self.opponent_id: ds_oponente})
+        self._excluidas = muertas | set(capturadas)
+        candidates = [m for m in possible_moves if m not in self._excluidas]
+        if not candidates:
+            self._excluidas = set()
+            candidates = possible_moves  # Cualquier jugada da igual: se conservan todas
 
-    def order_moves(self, board: HexBoard, possible_moves: list, ds_jugador: DisjointSet) -> list:
+        self._disco = []
+        if self.window is not None and board.size >= self.window_min_size:
+            with self.stats.phase("ventana"):
+                ventana, radius = h.ventana_candidatas(board, self.window)
+            candidates = [m for m in candidates if m in ventana] or candidates
+            self._disco = disco_hex(radius)
+        self.stats.pruned += len(possible_moves) - len(candidates)
+        return candidates
+
+    def order_moves(self, board: HexBoard, possible_moves: list, ds_jugador: UnionFind) -> list:
         """Ordena movimientos por heurística para optimizar poda alfa-beta."""
-        scores = []
-        for move in possible_moves:
-            new_board = board.clone()
-            new_board.place_piece(move[0], move[1], self.player_id)  # Modificar el clon
-            ds_clon = h.clonar_disjointset(ds_jugador)
-            ds_clon.add(move)
-            # Conectar con vecinos en el clon
-            for di, dj in [(-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0)]:
-                ni, nj = move[0] + di, move[1] + dj
-                if h.valid_position((ni, nj), new_board.size) and new_board.board[ni][nj] == self.player_id:
-                    ds_clon.merge(move, (ni, nj))
-            score = h.evaluate_board(self.player_id, self.opponent_id, new_board, ds_clon)
-            scores.append((move, score))
+        # Todas las jugadas se evalúan a la vez como deltas sobre la posición actual
+        candidatas = set(possible_moves)
+        scores = [(move, score) for move, score in h.evaluar_movimientos(self.player_id, self.opponent_id, board, ds_jugador)
+                  if move in candidatas]
         
         return sorted(scores, key=lambda x: -x[1])  # Mayor a menor
 
     def minimax_time(self, board: HexBoard, depth: int, is_maximizing: bool, alpha: float, beta: float,
-                    ds_jugador: DisjointSet, ds_oponente: DisjointSet, ordered_moves: list) -> float:
+                    ds_jugador: UnionFind, ds_oponente: UnionFind, ordered_moves: list) -> float:
         """Minimax con control de tiempo y ordenamiento dinámico."""
-        # Verificar tiempo en cada llamada
-        if time.time() - self.start_time >= self.time_limit:
+        # Verificar tiempo, nodos (o petición de parada del pondering) en cada llamada.
+        # Los tiempos por fase solo se toman con stats_timers: desactivados, cada fase cuesta una comprobación
+        stats = self.stats
+        timers = self.stats_timers
+        if self._stop or time.time() >= self._deadline or \
+                (self.max_nodes is not None and stats.nodes >= self.max_nodes):
             raise TimeoutError()
+        stats.nodes += 1
 
         # Condiciones terminales
-        if board.check_connection(self.player_id):
+        if timers:
+            t0 = time.perf_counter()
+        ganador = self.player_id if board.check_connection(self.player_id) else \
+                  self.opponent_id if board.check_connection(self.opponent_id) else 0
+        if timers:
+            stats.add_time("check_connection", time.perf_counter() - t0)
+        if ganador == self.player_id:
             return float('inf')
-        if board.check_connection(self.opponent_id):
+        if ganador == self.opponent_id:
             return float('-inf')
+
+        # Consultar la tabla de transposición (en la raíz siempre se busca para obtener el movimiento)
+        key = board.hash if is_maximizing else board.hash ^ SIDE_KEY
+        tt_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            stats.tt_hits += 1
+            tt_depth, tt_value, tt_flag, tt_move = entry
+            if tt_depth >= depth and depth != self._root_depth:
+                if tt_flag == EXACT:
+                    stats.tt_cutoffs += 1
+                    return tt_value
+                if tt_flag == LOWER:
+                    alpha = max(alpha, tt_value)
+                else:
+                    beta = min(beta, tt_value)
+                if alpha >= beta:
+                    stats.tt_cutoffs += 1
+                    return tt_value
+
+        # Conexión virtual de algún jugador: la partida ya está decidida (no en la raíz, que necesita una jugada)
+        if depth > 0 and depth != self._root_depth:
+            if timers:
+                t0 = time.perf_counter()
+            ganador = self.player_id if vc.conexion_virtual(board, self.player_id, ds_jugador) is not None else \
+                      self.opponent_id if vc.conexion_virtual(board, self.opponent_id, ds_oponente) is not None else 0
+            if timers:
+                stats.add_time("conexiones", time.perf_counter() - t0)
+            if ganador:
+                stats.vc_cutoffs += 1
+                value = float('inf') if ganador == self.player_id else float('-inf')
+                self.tt.store(key, depth, value, EXACT, None)
+                return value
+
         if depth == 0 or not board.get_possible_moves():
-            return h.evaluate_board(self.player_id, self.opponent_id, board, ds_jugador if is_maximizing else ds_oponente)
+            if timers:
+                t0 = time.perf_counter()
+            value = self._evaluator.value()  # evaluate_board del jugador, mantenido jugada a jugada
+            if timers:
+                stats.add_time("evaluacion", time.perf_counter() - t0)
+            self.tt.store(key, depth, value, EXACT, None)
+            return value
 
-        # Ordenar movimientos según nivel
-        current_moves = [m[0] for m in ordered_moves] if depth == self.max_depth else board.get_possible_moves()
-        if is_maximizing:
-            current_moves.sort(key=lambda m: self.eval_move(board, m, self.player_id, ds_jugador), reverse=True)
-        else:
-            current_moves.sort(key=lambda m: self.eval_move(board, m, self.opponent_id, ds_oponente))
+        # Ordenar movimientos: en la raíz, el mejor de la iteración anterior y después el orden heurístico;
+        # en el resto, tabla de transposición, killers e historial
+        ply = self._root_depth - depth
+        mover = self.player_id if is_maximizing else self.opponent_id
+        if timers:
+            t0 = time.perf_counter()
+        current_moves = self.sorted_moves(board, ply, mover, self.best_move if ply == 0 and self.best_move else tt_move)
+        if timers:
+            stats.add_time("ordenacion", time.perf_counter() - t0)
+        alpha_orig, beta_orig = alpha, beta
 
         best_val = float('-inf') if is_maximizing else float('inf')
         best_move = None
 
         for move in current_moves:
-            # Simular movimiento
-            new_board = board.clone()
-            new_board.place_piece(move[0], move[1], self.player_id if is_maximizing else self.opponent_id)
-            
-            # Actualizar DisjointSet correspondiente
-            if is_maximizing:
-                ds_clon = h.clonar_disjointset(ds_jugador)
-                ds_clon.add(move)
-                for di, dj in [(-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0)]:
-                    ni, nj = move[0] + di, move[1] + dj
-                    if h.valid_position((ni, nj), new_board.size) and new_board.board[ni][nj] == self.player_id:
-                        ds_clon.merge(move, (ni, nj))
-            else:
-                ds_clon = h.clonar_disjointset(ds_oponente)
-                ds_clon.add(move)
-                for di, dj in [(-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0)]:
-                    ni, nj = move[0] + di, move[1] + dj
-                    if h.valid_position((ni, nj), new_board.size) and new_board.board[ni][nj] == self.opponent_id:
-                        ds_clon.merge(move, (ni, nj))
-                
-
-            # Llamada recursiva
-            eval = self.minimax_time(new_board, depth-1, not is_maximizing, alpha, beta, 
-                                    ds_clon if is_maximizing else ds_jugador, 
-                                    ds_clon if not is_maximizing else ds_oponente, 
-                                    ordered_moves)
+            # Simular movimiento (se deshace tras la llamada recursiva)
+            ds = ds_jugador if is_maximizing else ds_oponente
+            if timers:
+                t0 = time.perf_counter()
+            board.make_move(move[0], move[1], mover)
+            # Actualizar el UnionFind correspondiente (se revierte con rollback)
+            mark = h.conectar_ficha(board, ds, move, mover)
+            if timers:
+                stats.add_time("make_move", time.perf_counter() - t0)
+            self._path.append(move)
+
+            # Llamada recursiva (PVS: tras la primera jugada, ventana nula y repetición solo si la mejora)
+            try:
+                if best_move is None or math.isinf(alpha if is_maximizing else beta):
+                    eval = self.minimax_time(board, depth-1, not is_maximizing, alpha, beta,
+                                             ds_jugador, ds_oponente, ordered_moves)
+                elif is_maximizing:
+                    eval = self.minimax_time(board, depth-1, False, alpha, alpha + PVS_EPSILON,
+                                             ds_jugador, ds_oponente, ordered_moves)
+                    if alpha < eval < beta:
+                        stats.researches += 1
+                        eval = self.minimax_time(board, depth-1, False, alpha, beta, ds_jugador, ds_oponente, ordered_moves)
+                else:
+                    eval = self.minimax_time(board, depth-1, True, beta - PVS_EPSILON, beta,
+                                             ds_jugador, ds_oponente, ordered_moves)
+                    if alpha < eval < beta:
+                        stats.researches += 1
+                        eval = self.minimax_time(board, depth-1, True, alpha, beta, ds_jugador, ds_oponente, ordered_moves)
+            finally:
+                # Restaurar tablero y UnionFind también si se agota el tiempo
+                if timers:
+                    t0 = time.perf_counter()
+                self._path.pop()
+                ds.rollback(mark)
+                board.undo_move()
+                if timers:
+                    stats.add_time("undo_move", time.perf_counter() - t0)
             
             # Actualizar mejor valor y movimiento
             if is_maximizing:
                 if eval > best_val:
                     best_val = eval
-                    if depth == self.max_depth:
-                        self.best_move = move
+                    best_move = move
+                    if ply == 0 and eval > alpha:
+                        self.best_move = move  # Resultado parcial: se conserva aunque la iteración no termine
                 alpha = max(alpha, eval)
             else:
                 if eval < best_val:
                     best_val = eval
+                    best_move = move
                 beta = min(beta, eval)
             
             # Poda
             if beta <= alpha:
+                stats.cutoffs += 1
+                # La jugada que provocó el corte se prueba antes en los nodos hermanos y en las siguientes iteraciones
+                killers = self._killers[ply]
+                if killers[0] != move:
+                    killers[1] = killers[0]
+                    killers[0] = move
+                self._history[mover][move[0] * board.size + move[1]] += depth * depth
                 break
 
+        if best_val <= alpha_orig:
+            flag = UPPER
+        elif best_val >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, best_val, flag, best_move)
         return best_val
-
-    def eval_move(self, board: HexBoard, move: tuple, player_id: int, ds: DisjointSet) -> float:
-        """Evaluación rápida para ordenamiento (sin clonar tablero)."""
-        # Lógica simplificada usando DisjointSet existente
-        grupos_conectados = set()
-        for di, dj in [(-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0)]:
-            ni, nj = move[0] + di, move[1] + dj
-            if h.valid_position((ni, nj), board.size) and board.board[ni][nj] == player_id:
-                try:
-                    grupos_conectados.add(ds.__getitem__((ni, nj)))
-                except KeyError:
-                    continue
-        return len(grupos_conectados) * 10  # Priorizar conexiones
\ No newline at end of file
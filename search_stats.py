@@ -0,0 +1,100 @@
+#search_stats.py
+
+import math
+import time
+from contextlib import nullcontext
+
+
+class _Fase:
+    """Acumula en `stats.phases[name]` el tiempo transcurrido dentro del bloque `with`."""
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats: "SearchStats", name: str):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.stats.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+_SIN_TIEMPO = nullcontext()
+
+
+class SearchStats:
+    """
+    Estadísticas de una búsqueda de AI_Player: nodos, cortes, aciertos de la tabla de transposición,
+    profundidad completada y tiempo por fase. Con `timers=False` no se mide ningún tiempo
+    (solo contadores), para no añadir coste al recorrido del árbol.
+    """
+
+    def __init__(self, timers: bool = True):
+        self.timers = timers
+        self.nodes = 0          # Llamadas a minimax_time
+        self.cutoffs = 0        # Podas alfa-beta dentro del bucle de movimientos
+        self.tt_hits = 0        # Entradas encontradas en la tabla de transposición
+        self.tt_cutoffs = 0     # Nodos resueltos directamente por la tabla
+        self.researches = 0     # Repeticiones por ventana nula (PVS) o de aspiración fallidas
+        self.pruned = 0         # Casillas muertas o capturadas excluidas en la raíz
+        self.vc_cutoffs = 0     # Nodos resueltos por una conexión virtual
+        self.depth = 0          # Última profundidad completada
+        self.score = None       # Valor de la raíz en esa profundidad (para quien mueve; ±inf si está demostrado)
+        self.timed_out = False  # La última iteración se interrumpió por tiempo
+        self.source = ""        # Origen del movimiento: libro, apertura, amenaza o busqueda
+        self.elapsed = 0.0      # Segundos totales de la jugada
+        self.phases = {}        # Segundos acumulados por fase
+
+    def phase(self, name: str):
+        """Contexto que mide una fase; no hace nada si los temporizadores están desactivados."""
+        return _Fase(self, name) if self.timers else _SIN_TIEMPO
+
+    def add_time(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def merge(self, other: "SearchStats"):
+        """Suma los contadores y tiempos de otra búsqueda (por ejemplo, de un proceso del pool)."""
+        self.nodes += other.nodes
+        self.cutoffs += other.cutoffs
+        self.tt_hits += other.tt_hits
+        self.tt_cutoffs += other.tt_cutoffs
+        self.researches += other.researches
+        self.vc_cutoffs += other.vc_cutoffs
+        for name, seconds in other.phases.items():
+            self.add_time(name, seconds)
+
+    @property
+    def nodes_per_sec(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def proven(self) -> str | None:
+        """"win" o "loss" si la búsqueda demostró el resultado (valor ±inf) para quien mueve; si no, None."""
+        if self.score is None or math.isfinite(self.score):
+            return None
+        return "win" if self.score > 0 else "loss"
+
+    def as_dict(self) -> dict:
+        """Diccionario serializable como JSON estricto: un valor demostrado da "score": None y "proven"."""
+        return {
+            "source": self.source,
+            "depth": self.depth,
+            "score": None if self.proven else self.score,
+            "proven": self.proven,
+            "timed_out": self.timed_out,
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "tt_hits": self.tt_hits,
+            "tt_cutoffs": self.tt_cutoffs,
+            "researches": self.researches,
+            "pruned": self.pruned,
+            "vc_cutoffs": self.vc_cutoffs,
+            "elapsed": self.elapsed,
+            "nodes_per_sec": self.nodes_per_sec,
+            "phases": dict(self.phases),
+        }
+
+    def __repr__(self):
+        return f"SearchStats({self.as_dict()})"
@@ -0,0 +1,24 @@
+import json
+
+from analysis import analizar_posicion
+from search_stats import SearchStats
+
+
+def test_resultado_demostrado_sin_infinitos():
+    size = 5
+    cells = [0] * (size * size)
+    for row, col, player_id in [(2, 1, 1), (2, 3, 1), (0, 0, 2), (0, 4, 2)]:
+        cells[row * size + col] = player_id
+    resultado = analizar_posicion({"id": 7, "size": size, "cells": cells, "to_move": 1}, time_limit=2.0)
+    assert resultado["proven"] == "win" and resultado["score"] is None
+    json.dumps(resultado, allow_nan=False)
+
+
+def test_as_dict_de_valores_demostrados_y_normales():
+    stats = SearchStats()
+    for score, proven in [(float("inf"), "win"), (float("-inf"), "loss"), (12.5, None), (None, None)]:
+        stats.score = score
+        datos = stats.as_dict()
+        assert datos["proven"] == proven
+        assert datos["score"] == (None if proven else score)
+        json.dumps(datos, allow_nan=False)
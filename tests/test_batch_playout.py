@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from batch_playout import ganadores, rellenar, simular
+from geometry import VECINOS
+
+
+def _ganador(tablero: np.ndarray) -> int:
+    """Ganador de un tablero lleno por inundación desde la columna izquierda con las fichas del jugador 1."""
+    size = tablero.shape[0]
+    pila = [(i, 0) for i in range(size) if tablero[i, 0] == 1]
+    visitadas = set(pila)
+    while pila:
+        i, j = pila.pop()
+        if j == size - 1:
+            return 1
+        for di, dj in VECINOS:
+            ni, nj = i + di, j + dj
+            if 0 <= ni < size and 0 <= nj < size and tablero[ni, nj] == 1 and (ni, nj) not in visitadas:
+                visitadas.add((ni, nj))
+                pila.append((ni, nj))
+    return 2
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 11, 13])
+def test_ganadores_coincide_con_el_tablero(size):
+    rng = np.random.default_rng(size)
+    llenos = rellenar(np.zeros((64, size, size), dtype=np.int8), rng.integers(1, 3, 64), rng)
+    esperado = [_ganador(tablero) for tablero in llenos]
+    assert ganadores(llenos).tolist() == esperado
+
+
+def test_ganadores_caminos_serpenteantes():
+    # Caminos del jugador 1 que suben y bajan varias veces: la propagación debe recorrer las filas en ambos sentidos
+    size = 7
+    tablero = np.full((size, size), 2, dtype=np.int8)
+    tablero[:, 0] = 1
+    tablero[0, :3] = 1
+    tablero[:, 2] = 1
+    tablero[size - 1, 2:5] = 1
+    tablero[:, 4] = 1
+    tablero[0, 4:] = 1
+    assert _ganador(tablero) == 1
+    assert ganadores(tablero[np.newaxis]).tolist() == [1]
+    assert ganadores(np.where(tablero == 1, 2, 1).T[np.newaxis].astype(np.int8)).tolist() == [2]
+
+
+def test_rellenar_respeta_fichas_y_turnos():
+    rng = np.random.default_rng(0)
+    board = np.zeros((5, 5), dtype=np.int8)
+    board[2, 2] = 1
+    board[0, 4] = 2
+    llenos, winners = simular(board, 1, 100, rng)
+    assert (llenos[:, 2, 2] == 1).all() and (llenos[:, 0, 4] == 2).all()
+    # 23 vacías desde el turno del jugador 1: 12 fichas más para él y 11 para el 2
+    assert ((llenos == 1).sum(axis=(1, 2)) == 13).all() and ((llenos == 2).sum(axis=(1, 2)) == 12).all()
+    assert set(winners.tolist()) <= {1, 2}
@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from board import HexBoard, zobrist_keys
+from geometry import VECINOS
+from unionfind import UnionFind
+
+
+def _componentes(board: HexBoard, player_id: int) -> dict:
+    """
+    Componente (número) de cada casilla del jugador y de sus dos bordes objetivo ("primero" y "ultimo")
+    por búsqueda en anchura sobre `board.board`: los bordes unen las fichas que los tocan, como en el union-find.
+    """
+    size = board.size
+    eje = 1 if player_id == 1 else 0  # Jugador 1: columnas 0 y N-1; jugador 2: filas 0 y N-1
+
+    def vecinos(nodo):
+        if nodo in ("primero", "ultimo"):
+            linea = 0 if nodo == "primero" else size - 1
+            return [(i, j) for i in range(size) for j in range(size)
+                    if board.board[i][j] == player_id and (i, j)[eje] == linea]
+        i, j = nodo
+        result = [(i + di, j + dj) for di, dj in VECINOS
+                  if 0 <= i + di < size and 0 <= j + dj < size and board.board[i + di][j + dj] == player_id]
+        if nodo[eje] == 0:
+            result.append("primero")
+        if nodo[eje] == size - 1:
+            result.append("ultimo")
+        return result
+
+    nodos = ["primero", "ultimo"] + [(i, j) for i in range(size) for j in range(size) if board.board[i][j] == player_id]
+    componente = {}
+    for inicio in nodos:
+        if inicio in componente:
+            continue
+        componente[inicio] = len(componente)
+        pila = [inicio]
+        while pila:
+            for vecino in vecinos(pila.pop()):
+                if vecino not in componente:
+                    componente[vecino] = componente[inicio]
+                    pila.append(vecino)
+    return componente
+
+
+def _conectado(board: HexBoard, player_id: int) -> bool:
+    componente = _componentes(board, player_id)
+    return componente["primero"] == componente["ultimo"]
+
+
+def _hash(board: HexBoard) -> int:
+    keys = zobrist_keys(board.size)
+    value = 0
+    for i, row in enumerate(board.board):
+        for j, cell in enumerate(row):
+            if cell:
+                value ^= keys[i * board.size + j][cell - 1]
+    return value
+
+
+def _comprobar(board: HexBoard):
+    for player_id in (1, 2):
+        assert board.check_connection(player_id) == _conectado(board, player_id)
+        # Dos fichas comparten raíz en el union-find si y solo si están en el mismo componente
+        componente = _componentes(board, player_id)
+        primero, ultimo = board.edge_roots(player_id)
+        raices = {}
+        for nodo, c in componente.items():
+            raiz = primero if nodo == "primero" else ultimo if nodo == "ultimo" else board.group_root(*nodo)
+            raices.setdefault(c, set()).add(raiz)
+        assert all(len(r) == 1 for r in raices.values())
+        assert len({next(iter(r)) for r in raices.values()}) == len(raices)
+    assert board.hash == _hash(board)
+
+
+@pytest.mark.parametrize("size", [1, 2, 4, 7, 11])
+@pytest.mark.parametrize("seed", range(4))
+def test_make_undo_conserva_conexiones_y_hash(size, seed):
+    rng = random.Random(f"{size}-{seed}")
+    board = HexBoard(size)
+    for k in range(rng.randint(0, size)):
+        board.place_piece(rng.randrange(size), rng.randrange(size), 1 + k % 2)
+    inicial = (board.hash, board._uf.parent[:], board._uf.rank[:], [row[:] for row in board.board])
+    _comprobar(board)
+
+    player_id = 1
+    for _ in range(8 * size * size):
+        moves = board.get_possible_moves()
+        if board._history and (not moves or rng.random() < 0.4):
+            board.undo_move()
+        elif moves:
+            assert board.make_move(*rng.choice(moves), player_id)
+            player_id = 3 - player_id
+        _comprobar(board)
+
+    while board._history:
+        board.undo_move()
+    assert (board.hash, board._uf.parent, board._uf.rank, board.board) == inicial
+
+
+def test_make_move_en_casilla_ocupada():
+    board = HexBoard(3)
+    assert board.make_move(1, 1, 1)
+    assert not board.make_move(1, 1, 2)
+    assert not board.place_piece(1, 1, 2)
+    board.undo_move()
+    assert board.hash == 0 and board.get_possible_moves() == [(i, j) for i in range(3) for j in range(3)]
+
+
+def test_clone_es_independiente():
+    board = HexBoard(5)
+    for j in range(4):
+        board.place_piece(2, j, 1)
+    copia = board.clone()
+    copia.make_move(2, 4, 1)
+    assert copia.check_connection(1) and not board.check_connection(1)
+    assert board.board[2][4] == 0 and board.hash == _hash(board)
+    copia.undo_move()
+    assert copia.hash == board.hash and copia.board == board.board
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_unionfind_rollback_restaura_el_estado(seed):
+    rng = random.Random(seed)
+    uf = UnionFind(40)
+    for _ in range(10):
+        uf.union(rng.randrange(40), rng.randrange(40))
+    estados = []
+    for _ in range(30):
+        estados.append((uf.mark(), uf.parent[:], uf.rank[:], bytes(uf.members)))
+        for _ in range(rng.randint(0, 4)):
+            uf.add(rng.randrange(40))
+            uf.union(rng.randrange(40), rng.randrange(40))
+    # Conectividad igual a la de una partición calculada a mano
+    for a in range(40):
+        for b in range(40):
+            assert uf.connected(a, b) == (uf.find(a) == uf.find(b))
+    for mark, parent, rank, members in reversed(estados):
+        uf.rollback(mark)
+        assert (uf.parent, uf.rank, bytes(uf.members)) == (parent, rank, members)
@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import pytest
+
+from gtp_server import SesionGTP, MIN_TIEMPO, _genmove
+
+
+def _sesion(time_limit: float = 5.0) -> SesionGTP:
+    return SesionGTP(None, 11, time_limit)  # time_settings no usa el pool de procesos
+
+
+def _ejecutar(sesion: SesionGTP, linea: str) -> str:
+    respuesta, _ = asyncio.run(sesion.ejecutar(linea))
+    return respuesta
+
+
+def test_byo_yomi_se_reparte_entre_sus_piedras():
+    sesion = _sesion()
+    assert _ejecutar(sesion, "time_settings 0 300 25") == "=\n\n"
+    assert sesion.time_limit == pytest.approx(12.0)
+    _ejecutar(sesion, "time_settings 600 30 1")
+    assert sesion.time_limit == pytest.approx(30.0)
+
+
+def test_tiempo_principal_sin_byo_yomi():
+    sesion = _sesion()
+    _ejecutar(sesion, "time_settings 600 0 0")
+    assert sesion.time_limit == pytest.approx(600 / (11 * 11 // 2))
+    _ejecutar(sesion, "time_settings 0 0 0")
+    assert sesion.time_limit == MIN_TIEMPO
+
+
+def test_byo_yomi_sin_piedras_es_sin_limite():
+    sesion = _sesion(2.5)
+    _ejecutar(sesion, "time_settings 0 300 25")
+    _ejecutar(sesion, "time_settings 0 300 0")
+    assert sesion.time_limit == 2.5
+
+
+@pytest.mark.parametrize("args", ["-1 300 25", "0 -300 25", "0 300 -1", "0 300", "0 300 2.5", "0 nan 1", "a b c"])
+def test_argumentos_invalidos(args):
+    sesion = _sesion()
+    assert _ejecutar(sesion, f"time_settings {args}").startswith("? ")
+    assert sesion.time_limit == 5.0
+
+
+def _rechazar(constante):
+    raise AssertionError(f"{constante} no es JSON válido")
+
+
+def test_hex_stats_de_una_victoria_demostrada_es_json_valido():
+    size = 5
+    cells = [0] * (size * size)
+    for row, col, player_id in [(2, 1, 1), (2, 3, 1), (0, 0, 2), (0, 4, 2)]:
+        cells[row * size + col] = player_id
+    sesion = _sesion()
+    _, sesion.last_stats = _genmove(cells, size, 1, 2.0)
+    respuesta = _ejecutar(sesion, "hex-stats")
+    assert respuesta.startswith("= ")
+    stats = json.loads(respuesta[2:], parse_constant=_rechazar)
+    assert stats["proven"] == "win" and stats["score"] is None
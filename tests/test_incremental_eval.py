@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from board import HexBoard
+from incremental_eval import IncrementalEvaluator
+import heuristics as h
+
+
+def _comprobar(board, evaluadores):
+    for player_id, evaluador in evaluadores.items():
+        esperado = h.evaluate_board(player_id, 3 - player_id, board, h.obtener_disjointsets(board, player_id))
+        assert evaluador.value() == pytest.approx(esperado, rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 7, 11])
+@pytest.mark.parametrize("seed", range(3))
+def test_value_coincide_con_evaluate_board(size, seed):
+    rng = random.Random(f"{size}-{seed}")
+    board = HexBoard(size)
+    # Algunas fichas antes de adjuntar los evaluadores (estado inicial no vacío)
+    for k in range(rng.randint(0, size)):
+        board.place_piece(rng.randrange(size), rng.randrange(size), 1 + k % 2)
+    evaluadores = {p: IncrementalEvaluator(board, p) for p in (1, 2)}
+    for evaluador in evaluadores.values():
+        board.attach(evaluador)
+    _comprobar(board, evaluadores)
+
+    player_id = 1
+    for _ in range(6 * size * size):
+        moves = board.get_possible_moves()
+        if board._history and (not moves or rng.random() < 0.35):
+            board.undo_move()
+        elif moves:
+            row, col = rng.choice(moves)
+            assert board.make_move(row, col, player_id)
+            player_id = 3 - player_id
+        _comprobar(board, evaluadores)
+
+    while board._history:
+        board.undo_move()
+        _comprobar(board, evaluadores)
@@ -0,0 +1,169 @@
+import random
+from functools import lru_cache
+
+import pytest
+
+from board import HexBoard
+from geometry import VECINOS
+from player import AI_Player
+import heuristics as h
+import vc_analysis as vc
+
+
+def _ganador(cells: tuple, size: int) -> int:
+    """Ganador de la posición (0 si nadie ha conectado), por búsqueda en profundidad desde el primer borde."""
+    for player_id in (1, 2):
+        if player_id == 1:
+            pila = [(i, 0) for i in range(size) if cells[i * size] == 1]
+        else:
+            pila = [(0, j) for j in range(size) if cells[j] == 2]
+        vistas = set(pila)
+        while pila:
+            i, j = pila.pop()
+            if (j if player_id == 1 else i) == size - 1:
+                return player_id
+            for di, dj in VECINOS:
+                ni, nj = i + di, j + dj
+                if 0 <= ni < size and 0 <= nj < size and (ni, nj) not in vistas and cells[ni * size + nj] == player_id:
+                    vistas.add((ni, nj))
+                    pila.append((ni, nj))
+    return 0
+
+
+def _resolver(size: int):
+    """Resolvedor exhaustivo: resolver(cells, al_turno) devuelve el jugador que gana con juego perfecto."""
+    @lru_cache(maxsize=None)
+    def resolver(cells: tuple, to_move: int) -> int:
+        ganador = _ganador(cells, size)
+        if ganador:
+            return ganador
+        for idx, cell in enumerate(cells):
+            if cell == 0 and resolver(cells[:idx] + (to_move,) + cells[idx + 1:], 3 - to_move) == to_move:
+                return to_move
+        return 3 - to_move
+    return resolver
+
+
+_RESOLVEDORES = {}
+
+
+def _resolver_de(size: int):
+    if size not in _RESOLVEDORES:
+        _RESOLVEDORES[size] = _resolver(size)
+    return _RESOLVEDORES[size]
+
+
+def _rellenar(cells: tuple, size: int, relleno: dict) -> tuple:
+    cells = list(cells)
+    for (i, j), player_id in relleno.items():
+        cells[i * size + j] = player_id
+    return tuple(cells)
+
+
+def _tablero(cells: tuple, size: int) -> HexBoard:
+    board = HexBoard(size)
+    for idx, cell in enumerate(cells):
+        if cell:
+            board.place_piece(idx // size, idx % size, cell)
+    return board
+
+
+def _posiciones(size: int, count: int, seed: int) -> list:
+    """Posiciones aleatorias sin ganador, con piedras alternadas (y algún desequilibrio)."""
+    rng = random.Random(seed)
+    posiciones = []
+    while len(posiciones) < count:
+        stones = rng.randint(size * size // 3, size * size // 2 + 2)
+        cells = [0] * (size * size)
+        for n, idx in enumerate(rng.sample(range(size * size), stones)):
+            cells[idx] = 1 + n % 2 if rng.random() < 0.8 else rng.randint(1, 2)
+        if not _ganador(tuple(cells), size):
+            posiciones.append(tuple(cells))
+    return posiciones
+
+
+def _captor(board: HexBoard, ds: dict, celda: tuple, pareja: tuple) -> int:
+    """Jugador para el que (celda, pareja) es un par capturado."""
+    return next(p for p in (1, 2) if vc.celda_muerta(board, ds, *celda, {pareja: p})
+                and vc.celda_muerta(board, ds, *pareja, {celda: p}))
+
+
+_CASOS = [(3, 60, 1), (4, 80, 2)]
+
+
+@pytest.mark.parametrize("size,count,seed", _CASOS)
+def test_celdas_inferiores_no_cambian_el_resultado(size, count, seed):
+    resolver = _resolver_de(size)
+    for cells in _posiciones(size, count, seed):
+        board = _tablero(cells, size)
+        ds = {p: h.obtener_disjointsets(board, p) for p in (1, 2)}
+        muertas, capturadas = vc.celdas_inferiores(board, ds)
+        base = {to_move: resolver(cells, to_move) for to_move in (1, 2)}
+        for celda in muertas:
+            for player_id in (1, 2):
+                rellena = _rellenar(cells, size, {celda: player_id})
+                assert all(resolver(rellena, t) == base[t] for t in (1, 2)), (cells, celda, player_id)
+        for celda, pareja in capturadas.items():
+            captor = _captor(board, ds, celda, pareja)
+            rellena = _rellenar(cells, size, {celda: captor, pareja: captor})
+            assert all(resolver(rellena, t) == base[t] for t in (1, 2)), (cells, celda, pareja)
+
+
+@pytest.mark.parametrize("size,count,seed", _CASOS)
+def test_conexion_virtual_es_una_victoria(size, count, seed):
+    resolver = _resolver_de(size)
+    for cells in _posiciones(size, count, seed):
+        board = _tablero(cells, size)
+        for player_id in (1, 2):
+            if vc.conexion_virtual(board, player_id, h.obtener_disjointsets(board, player_id)) is not None:
+                assert resolver(cells, 1) == resolver(cells, 2) == player_id, (cells, player_id)
+
+
+@pytest.mark.parametrize("size,count,seed", _CASOS)
+def test_excluir_en_todo_el_arbol_conserva_el_valor(size, count, seed):
+    """
+    Juego reducido en el que nadie juega en las casillas excluidas en la raíz (como en la búsqueda):
+    al agotarse las demás, las muertas se rellenan con cualquier color y cada par capturado con su captor.
+    """
+    resolver = _resolver_de(size)
+    for cells in _posiciones(size, count, seed):
+        board = _tablero(cells, size)
+        ds = {p: h.obtener_disjointsets(board, p) for p in (1, 2)}
+        for to_move in (1, 2):
+            ai = AI_Player(to_move, window=None)
+            candidatas = ai.candidate_moves(board, ds[to_move], ds[3 - to_move])
+            muertas, capturadas = vc.celdas_inferiores(board, ds)
+            relleno = {celda: 1 for celda in muertas}
+            relleno.update((celda, _captor(board, ds, celda, pareja)) for celda, pareja in capturadas.items())
+            indices = [i * size + j for i, j in candidatas]
+
+            @lru_cache(maxsize=None)
+            def reducido(estado: tuple, turno: int) -> int:
+                ganador = _ganador(estado, size)
+                if ganador:
+                    return ganador
+                libres = [idx for idx in indices if estado[idx] == 0]
+                if not libres:
+                    return _ganador(_rellenar(estado, size, relleno), size)
+                for idx in libres:
+                    if reducido(estado[:idx] + (turno,) + estado[idx + 1:], 3 - turno) == turno:
+                        return turno
+                return 3 - turno
+
+            assert reducido(cells, to_move) == resolver(cells, to_move), (cells, to_move, candidatas)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_ai_player_encuentra_la_jugada_ganadora(seed):
+    size = 4
+    resolver = _resolver_de(size)
+    for cells in _posiciones(size, 8, seed):
+        to_move = 1 if cells.count(1) <= cells.count(2) else 2
+        if resolver(cells, to_move) != to_move:
+            continue
+        board = _tablero(cells, size)
+        ai = AI_Player(to_move, max_depth=cells.count(0), time_limit=60, window=None)
+        ai.first_move = False
+        row, col = ai.play(board)
+        assert cells[row * size + col] == 0
+        assert resolver(_rellenar(cells, size, {(row, col): to_move}), 3 - to_move) == to_move, (cells, (row, col))
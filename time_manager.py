@@ -0,0 +1,59 @@
+#time_manager.py
+
+from board import HexBoard
+import heuristics as h
+
+# Reparto del tiempo de partida
+MIN_MOVES_LEFT = 5        # Jugadas propias restantes supuestas como mínimo
+OPENING_FACTOR = 1.5      # Más tiempo mientras hay menos de N fichas en el tablero
+TACTICAL_FACTOR = 1.5     # Más tiempo si algún jugador tiene casillas que lo conectan virtualmente
+MAX_SHARE = 0.25          # Fracción máxima del tiempo restante para una jugada
+MIN_BUDGET = 0.05         # Segundos mínimos por jugada
+
+# Predicción del coste de la siguiente profundidad (factor de ramificación efectivo)
+DEFAULT_GROWTH = 4.0
+MIN_GROWTH, MAX_GROWTH = 1.5, 10.0
+
+
+class TimeManager:
+    """
+    Decide cuánto tiempo dedicar a cada jugada y si merece la pena empezar la siguiente profundidad.
+    Sin `game_time` cada jugada dispone de `move_time` segundos (el comportamiento de siempre). Con
+    `game_time` se reparte el tiempo restante de la partida entre las jugadas que quedan, con más tiempo
+    en la apertura y en posiciones tácticas, sin superar `move_time` en ninguna jugada.
+    """
+
+    def __init__(self, game_time: float | None = None):
+        self.game_time = game_time
+        self.remaining = game_time
+
+    def budget(self, board: HexBoard, player_id: int, move_time: float) -> float:
+        """Segundos para la jugada de `player_id` en la posición actual."""
+        if self.remaining is None:
+            return move_time
+        vacias = sum(row.count(0) for row in board.board)
+        base = self.remaining / max(vacias // 3, MIN_MOVES_LEFT)
+        if board.size * board.size - vacias < board.size:
+            base *= OPENING_FACTOR
+        if any(h.detectar_amenazas(board, p)[1] for p in (player_id, 3 - player_id)):
+            base *= TACTICAL_FACTOR
+        return max(min(base, self.remaining * MAX_SHARE, move_time), MIN_BUDGET)
+
+    def consume(self, seconds: float):
+        """Descuenta del tiempo de partida lo que tardó la jugada."""
+        if self.remaining is not None:
+            self.remaining = max(self.remaining - seconds, 0.0)
+
+    @staticmethod
+    def next_iteration_fits(iteration_times: list, elapsed: float, budget: float) -> bool:
+        """
+        Predice si la siguiente profundidad terminará dentro de `budget` a partir de la duración de las
+        iteraciones completadas (la última por el crecimiento observado entre las dos últimas).
+        """
+        if not iteration_times:
+            return elapsed < budget
+        last = iteration_times[-1]
+        growth = DEFAULT_GROWTH
+        if len(iteration_times) > 1 and iteration_times[-2] > 0:
+            growth = min(max(last / iteration_times[-2], MIN_GROWTH), MAX_GROWTH)
+        return elapsed + last * growth <= budget
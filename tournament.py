@@ -0,0 +1,201 @@
+#tournament.py
+
+import argparse
+import ast
+import csv
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from board import HexBoard
+from player import AI_Player
+from mcts_player import MCTS_Player
+from parallel_search import ParallelAI_Player
+
+# Motores disponibles en las especificaciones "motor:clave=valor,..."
+MOTORES = {
+    "minimax": AI_Player,
+    "mcts": MCTS_Player,
+    "parallel": ParallelAI_Player,
+}
+# Valores por defecto de cada motor dentro de un torneo: las partidas ya se juegan en paralelo, así que
+# cada jugador usa un solo proceso (si no, los núcleos se reparten entre partidas y se falsean tiempos y nodos/s)
+DEFECTOS = {
+    "mcts": {"workers": 1},
+    "parallel": {"workers": 1},
+}
+# Abreviaturas de parámetros aceptadas en las especificaciones
+ALIAS = {"depth": "max_depth", "time": "time_limit", "book": "opening_book"}
+
+
+def parse_spec(spec: str) -> tuple[str, dict]:
+    """'minimax:depth=3,time=0.5' -> ('minimax', {'max_depth': 3, 'time_limit': 0.5})."""
+    motor, _, params = spec.partition(":")
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor!r} (disponibles: {', '.join(MOTORES)})")
+    kwargs = {}
+    for item in filter(None, params.split(",")):
+        key, _, value = item.partition("=")
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass  # Se deja como cadena (por ejemplo, rutas)
+        kwargs[ALIAS.get(key, key)] = value
+    return motor, kwargs
+
+
+def crear_jugador(spec: str, player_id: int, seed: int | None = None):
+    motor, kwargs = parse_spec(spec)
+    kwargs.setdefault("seed", seed)
+    for key, value in DEFECTOS.get(motor, {}).items():
+        kwargs.setdefault(key, value)
+    return MOTORES[motor](player_id, **kwargs)
+
+
+def _metricas(player, stats) -> dict:
+    """Métricas de la última jugada: las SearchStats de AI_Player o las simulaciones de MCTS."""
+    if stats is not None:
+        return stats.as_dict()
+    return {"nodes": getattr(player, "last_simulations", 0), "depth": None}
+
+
+def jugar_partida(board: HexBoard, players: dict, on_move=None) -> int:
+    """
+    Juega sin interacción hasta que alguien conecte sus bordes; devuelve el ganador (0 si no quedan casillas).
+    `on_move(jugador, movimiento, segundos, stats)` se llama tras cada jugada; `stats` son las SearchStats
+    de los jugadores que tienen `play_with_stats` (None para el resto).
+    """
+    current_player = 1
+    while True:
+        if board.check_connection(1):
+            return 1
+        if board.check_connection(2):
+            return 2
+        if not board.get_possible_moves():
+            return 0
+        player = players[current_player]
+        stats = None
+        start = time.perf_counter()
+        if hasattr(player, "play_with_stats"):
+            move, stats = player.play_with_stats(board)
+        else:
+            move = player.play(board)
+        elapsed = time.perf_counter() - start
+        if not board.place_piece(move[0], move[1], current_player):
+            raise RuntimeError(f"Jugada ilegal de {current_player}: {move}")
+        if on_move is not None:
+            on_move(current_player, move, elapsed, stats)
+        current_player = 3 - current_player
+
+
+def _partida(args: tuple) -> dict:
+    """Juega una partida en un proceso del pool y devuelve su registro."""
+    size, spec_1, spec_2, seed = args
+    players = {1: crear_jugador(spec_1, 1, seed), 2: crear_jugador(spec_2, 2, seed + 1)}
+    moves = []
+
+    def registrar(player_id, move, elapsed, stats):
+        metricas = _metricas(players[player_id], stats)
+        moves.append({**metricas, "player": player_id, "move": list(move), "seconds": elapsed})
+
+    try:
+        winner = jugar_partida(HexBoard(size), players, registrar)
+    finally:
+        for player in players.values():
+            if hasattr(player, "close"):
+                player.close()
+    return {"size": size, "specs": {1: spec_1, 2: spec_2}, "seed": seed, "winner": winner, "moves": moves}
+
+
+def _percentil(values: list, q: float) -> float | None:
+    return float(np.percentile(values, q)) if values else None
+
+
+def resumir(games: list) -> list[dict]:
+    """Una fila por (tamaño, motor): partidas, victorias, latencias, nodos/s y profundidad."""
+    filas = {}
+    for game in games:
+        for player_id in (1, 2):
+            spec = game["specs"][player_id]
+            fila = filas.setdefault((game["size"], spec),
+                                   {"games": 0, "wins": 0, "seconds": [], "nodes": 0, "cutoffs": 0, "depths": []})
+            fila["games"] += 1
+            fila["wins"] += game["winner"] == player_id
+            for move in game["moves"]:
+                if move["player"] == player_id:
+                    fila["seconds"].append(move["seconds"])
+                    fila["nodes"] += move["nodes"]
+                    fila["cutoffs"] += move.get("cutoffs", 0)
+                    if move["depth"]:
+                        fila["depths"].append(move["depth"])
+
+    resumen = []
+    for (size, spec), fila in sorted(filas.items()):
+        total = sum(fila["seconds"])
+        resumen.append({
+            "size": size,
+            "player": spec,
+            "games": fila["games"],
+            "wins": fila["wins"],
+            "win_rate": fila["wins"] / fila["games"],
+            "moves": len(fila["seconds"]),
+            "latency_p50": _percentil(fila["seconds"], 50),
+            "latency_p90": _percentil(fila["seconds"], 90),
+            "latency_p99": _percentil(fila["seconds"], 99),
+            "nodes_per_sec": fila["nodes"] / total if total else None,
+            "cutoffs_per_node": fila["cutoffs"] / fila["nodes"] if fila["nodes"] else None,
+            "depth_mean": float(np.mean(fila["depths"])) if fila["depths"] else None,
+            "depth_max": max(fila["depths"]) if fila["depths"] else None,
+        })
+    return resumen
+
+
+def torneo(specs: list[str], sizes: list[int], games: int, workers: int | None = None, seed: int = 0) -> list:
+    """
+    Enfrenta cada par de especificaciones `games` veces por tamaño, alternando colores,
+    con las partidas repartidas entre procesos. Devuelve los registros de las partidas.
+    """
+    tasks = []
+    for size in sizes:
+        for spec_a, spec_b in itertools.combinations(specs, 2):
+            for k in range(games):
+                pair = (spec_a, spec_b) if k % 2 == 0 else (spec_b, spec_a)
+                tasks.append((size, pair[0], pair[1], seed + 2 * len(tasks)))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(_partida, tasks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torneo sin interacción entre motores de Hex.")
+    parser.add_argument("--players", nargs="+", required=True,
+                        help="Especificaciones 'motor:clave=valor,...' (motores: %s)" % ", ".join(MOTORES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[5], help="Tamaños de tablero")
+    parser.add_argument("--games", type=int, default=10, help="Partidas por pareja y tamaño")
+    parser.add_argument("--workers", type=int, default=None, help="Partidas simultáneas (por defecto, todos los núcleos)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla base de los jugadores")
+    parser.add_argument("--json", default=None, help="Fichero JSON con el resumen y todas las partidas")
+    parser.add_argument("--csv", default=None, help="Fichero CSV con el resumen")
+    args = parser.parse_args()
+    if len(args.players) < 2:
+        parser.error("Se necesitan al menos dos jugadores")
+
+    games = torneo(args.players, args.sizes, args.games, args.workers, args.seed)
+    resumen = resumir(games)
+
+    for fila in resumen:
+        print(f"{fila['size']:>3} {fila['player']:<40} victorias {fila['wins']}/{fila['games']} "
+              f"p50 {fila['latency_p50']:.3f}s p90 {fila['latency_p90']:.3f}s "
+              f"nodos/s {fila['nodes_per_sec'] or 0:.0f} prof. media {fila['depth_mean'] or 0:.1f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": resumen, "games": games}, f, indent=2)
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(resumen[0]))
+            writer.writeheader()
+            writer.writerows(resumen)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# transposition.py
+
+from array import array
+
+# Tipos de cota almacenados junto al valor
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Clave que distingue la misma posición según a quién le toque mover
+SIDE_KEY = 0x9E3779B97F4A7C15
+
+# Bytes por entrada: clave (Q), valor (d) y metadatos empaquetados (q), en tres arrays preasignados
+ENTRY_BYTES = 24
+
+# Metadatos de una ranura: generación << 40 | profundidad << 24 | cota << 16 | movimiento (fila << 8 | columna)
+_SIN_MOVIMIENTO = 0xFFFF
+_VACIA = -1
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición de tamaño fijo indexada por hash de Zobrist.
+    Cada ranura guarda (clave, profundidad, valor, tipo de cota, mejor movimiento, generación) repartidos
+    en arrays de tamaño fijo, así que ocupa exactamente `capacity * ENTRY_BYTES` bytes.
+    Reemplazo: se prefiere la entrada más profunda, salvo que la existente sea de una búsqueda anterior.
+    """
+
+    def __init__(self, max_mb: float = 16.0):
+        self.capacity = max(1, int(max_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.generation = 0
+        self.clear()
+
+    def new_search(self):
+        """Marca el inicio de una nueva búsqueda (las entradas antiguas pasan a ser reemplazables)."""
+        self.generation += 1
+
+    def clear(self):
+        self._keys = array("Q", bytes(8 * self.capacity))
+        self._values = array("d", bytes(8 * self.capacity))
+        self._meta = array("q", [_VACIA]) * self.capacity
+
+    def probe(self, key: int) -> tuple | None:
+        """Devuelve (profundidad, valor, tipo de cota, mejor movimiento) o None si no hay entrada."""
+        index = key % self.capacity
+        meta = self._meta[index]
+        if meta == _VACIA or self._keys[index] != key:
+            return None
+        move = meta & 0xFFFF
+        return ((meta >> 24) & 0xFFFF, self._values[index], (meta >> 16) & 0xFF,
+                None if move == _SIN_MOVIMIENTO else (move >> 8, move & 0xFF))
+
+    def store(self, key: int, depth: int, value: float, flag: int, best_move: tuple | None):
+        index = key % self.capacity
+        meta = self._meta[index]
+        if meta != _VACIA:
+            same = self._keys[index] == key
+            if not same and meta >> 40 == self.generation and (meta >> 24) & 0xFFFF > depth:
+                return  # Conservar la entrada más profunda de la búsqueda actual
+            if same and best_move is None:
+                move = meta & 0xFFFF  # No perder el movimiento conocido de la posición
+            else:
+                move = _SIN_MOVIMIENTO if best_move is None else best_move[0] << 8 | best_move[1]
+        else:
+            move = _SIN_MOVIMIENTO if best_move is None else best_move[0] << 8 | best_move[1]
+        self._keys[index] = key
+        self._values[index] = value
+        self._meta[index] = self.generation << 40 | depth << 24 | flag << 16 | move
@@ -0,0 +1,86 @@
+# unionfind.py
+
+
+class UnionFind:
+    """
+    Union-find sobre índices 0..n-1 (casilla = fila * N + columna) respaldado por listas planas.
+    Usa unión por rango sin compresión de caminos, de modo que cada `add`/`union` queda
+    registrado y puede deshacerse en O(1) con `rollback`.
+    """
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+        self.members = bytearray(n)  # 1 si el índice fue añadido con `add`
+        self._log = []               # (hijo, raíz, rango incrementado) o (índice, -1, False) para `add`
+
+    def __contains__(self, i: int) -> bool:
+        return self.members[i] == 1
+
+    def __getitem__(self, i: int) -> int:
+        """Raíz del grupo de un elemento añadido (KeyError si no pertenece, como DisjointSet)."""
+        if not self.members[i]:
+            raise KeyError(i)
+        return self.find(i)
+
+    def add(self, i: int):
+        if not self.members[i]:
+            self.members[i] = 1
+            self._log.append((i, -1, False))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> bool:
+        """Une los grupos de `a` y `b`; devuelve False si ya estaban unidos."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        rank = self.rank
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        bumped = rank[ra] == rank[rb]
+        if bumped:
+            rank[ra] += 1
+        self._log.append((rb, ra, bumped))
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def mark(self) -> int:
+        """Punto de restauración para `rollback`."""
+        return len(self._log)
+
+    def rollback(self, mark: int):
+        """Deshace todos los `add`/`union` posteriores a `mark`."""
+        log = self._log
+        parent, rank, members = self.parent, self.rank, self.members
+        while len(log) > mark:
+            child, root, bumped = log.pop()
+            if root == -1:
+                members[child] = 0
+            else:
+                parent[child] = child
+                if bumped:
+                    rank[root] -= 1
+
+    def copy(self) -> "UnionFind":
+        new = UnionFind.__new__(UnionFind)
+        new.parent = self.parent[:]
+        new.rank = self.rank[:]
+        new.members = bytearray(self.members)
+        new._log = self._log[:]
+        return new
+
+    def groups(self) -> dict[int, list[int]]:
+        """Elementos añadidos agrupados por raíz."""
+        result = {}
+        for i, present in enumerate(self.members):
+            if present:
+                result.setdefault(self.find(i), []).append(i)
+        return result
@@ -0,0 +1,197 @@
+#vc_analysis.py
+
+from board import HexBoard
+from unionfind import UnionFind
+import heuristics as h
+from geometry import geometria, ANILLO
+
+# Nodos de los bordes del jugador en el grafo de conexiones (las raíces del UnionFind son >= 0)
+BORDE_A, BORDE_B = -1, -2
+
+# Límite de nodos expandidos al buscar una cadena de conexiones virtuales
+MAX_EXPANSIONES = 5000
+
+
+def _etiquetas(board: HexBoard, ds: UnionFind, row: int, col: int, player_id: int, extra: dict) -> list:
+    """
+    Para cada vecino del anillo de (row, col), desde el punto de vista de `player_id`:
+    None si está bloqueado (ficha o borde del rival), ("v", k) si está vacío, o el identificador
+    de su grupo (raíz del UnionFind, borde propio o ficha hipotética de `extra`).
+    """
+    size = board.size
+    cells = board.board
+    etiquetas = []
+    for k, (di, dj) in enumerate(ANILLO):
+        ni, nj = row + di, col + dj
+        if not (0 <= ni < size and 0 <= nj < size):
+            # Fuera del tablero: borde propio si se sale por el eje del jugador
+            eje = nj if player_id == 1 else ni
+            etiquetas.append(BORDE_A if eje < 0 else BORDE_B if eje >= size else None)
+            continue
+        cell = extra.get((ni, nj), cells[ni][nj])
+        if cell == 0:
+            etiquetas.append(("v", k))
+        elif cell != player_id:
+            etiquetas.append(None)
+        elif (ni, nj) in extra:
+            etiquetas.append(("h", ni, nj))
+        else:
+            etiquetas.append(ds.find(ni * size + nj))
+    return etiquetas
+
+
+def _util(etiquetas: list) -> bool:
+    """
+    Una casilla puede formar parte de un camino mínimo si tiene dos vecinos disponibles no adyacentes
+    que no pertenezcan ya al mismo grupo (si no, el camino podría evitarla).
+    """
+    solida = [e is not None and not (isinstance(e, tuple) and e[0] == "v") for e in etiquetas]
+    # Vecinos consecutivos del anillo son adyacentes entre sí: sus grupos están unidos
+    clase = {}
+
+    def raiz(e):
+        while clase.get(e, e) != e:
+            e = clase[e]
+        return e
+
+    for k in range(6):
+        siguiente = (k + 1) % 6
+        if solida[k] and solida[siguiente]:
+            a, b = raiz(etiquetas[k]), raiz(etiquetas[siguiente])
+            if a != b:
+                clase[a] = b
+
+    for i in range(6):
+        if etiquetas[i] is None:
+            continue
+        for j in range(i + 2, min(i + 5, 6)):  # Pares no adyacentes del anillo
+            if etiquetas[j] is None:
+                continue
+            if not (solida[i] and solida[j] and raiz(etiquetas[i]) == raiz(etiquetas[j])):
+                return True
+    return False
+
+
+def celda_muerta(board: HexBoard, ds: dict, row: int, col: int, extra: dict | None = None) -> bool:
+    """
+    True si la casilla vacía no puede formar parte de ningún camino ganador mínimo de ningún jugador:
+    rellenarla con cualquier color no cambia el resultado. `ds` es {jugador: UnionFind de sus fichas}
+    y `extra` fichas hipotéticas {(fila, columna): jugador}.
+    """
+    extra = extra or {}
+    return not any(_util(_etiquetas(board, ds[p], row, col, p, extra)) for p in (1, 2))
+
+
+def celdas_inferiores(board: HexBoard, ds: dict) -> tuple[set, dict]:
+    """
+    Devuelve (muertas, capturadas):
+    - muertas: casillas vacías muertas (ver celda_muerta).
+    - capturadas: {casilla: pareja} para pares de casillas vacías adyacentes en los que, si un jugador
+      ocupa una, la otra queda muerta (y viceversa). Quien los captura puede responder a una intrusión
+      en la otra casilla, así que jugar en el par no aporta nada a ninguno de los dos.
+    Ambas propiedades se mantienen al añadir fichas mientras las casillas sigan vacías.
+    """
+    size = board.size
+    cells = board.board
+    muertas = set()
+    vacias = [(i, j) for i in range(size) for j in range(size) if cells[i][j] == 0]
+    for row, col in vacias:
+        if celda_muerta(board, ds, row, col):
+            muertas.add((row, col))
+
+    capturadas = {}
+    for row, col in vacias:
+        if (row, col) in muertas or (row, col) in capturadas:
+            continue
+        for di, dj in ANILLO[1:4]:  # Cada par de vecinas una sola vez
+            pareja = (row + di, col + dj)
+            if not h.valid_position(pareja, size) or cells[pareja[0]][pareja[1]] != 0 \
+                    or pareja in muertas or pareja in capturadas:
+                continue
+            for p in (1, 2):
+                if celda_muerta(board, ds, row, col, {pareja: p}) and \
+                        celda_muerta(board, ds, pareja[0], pareja[1], {(row, col): p}):
+                    capturadas[(row, col)] = pareja
+                    capturadas[pareja] = (row, col)
+                    break
+            if (row, col) in capturadas:
+                break
+    return muertas, capturadas
+
+
+def conexion_virtual(board: HexBoard, player_id: int, ds: UnionFind) -> set | None:
+    """
+    Busca una conexión virtual entre los dos bordes de `player_id` (búsqueda tipo H-search con puentes):
+    dos grupos (o un grupo y su borde) con al menos dos casillas vacías adyacentes a ambos están
+    conectados virtualmente, y las conexiones se encadenan a través de grupos si sus portadores son disjuntos.
+    Devuelve el portador (casillas vacías que hay que defender) o None si no se encuentra ninguna.
+    Si existe, `player_id` gana aunque le toque mover al rival.
+    """
+    size = board.size
+    cells = board.board
+    vecinos_rc = geometria(size).vecinos_rc
+
+    # Grupos que tocan un borde se identifican con ese borde
+    alias = {}
+    for row, col in board.player_positions[player_id]:
+        eje = col if player_id == 1 else row
+        if eje == 0 or eje == size - 1:
+            raiz = ds.find(row * size + col)
+            borde = BORDE_A if eje == 0 else BORDE_B
+            if alias.get(raiz, borde) != borde:
+                return set()  # El grupo ya conecta los dos bordes
+            alias[raiz] = borde
+
+    # Casillas vacías comunes a cada par de nodos (grupos o bordes); solo las vecinas de alguna ficha
+    # pueden tocar dos nodos
+    vecinas = set()
+    for row, col in board.player_positions[player_id]:
+        for ni, nj in vecinos_rc[row][col]:
+            if cells[ni][nj] == 0:
+                vecinas.add((ni, nj))
+    comunes = {}
+    for row, col in sorted(vecinas):
+        nodos = set()
+        for ni, nj in vecinos_rc[row][col]:
+            if cells[ni][nj] == player_id:
+                raiz = ds.find(ni * size + nj)
+                nodos.add(alias.get(raiz, raiz))
+        eje = col if player_id == 1 else row
+        if eje == 0:
+            nodos.add(BORDE_A)
+        if eje == size - 1:
+            nodos.add(BORDE_B)
+        if len(nodos) < 2:
+            continue
+        nodos = sorted(nodos)
+        for a in range(len(nodos)):
+            for b in range(a + 1, len(nodos)):
+                comunes.setdefault((nodos[a], nodos[b]), []).append((row, col))
+
+    grafo = {}
+    for (u, v), portadores in comunes.items():
+        if len(portadores) >= 2:
+            grafo.setdefault(u, []).append((v, portadores))
+            grafo.setdefault(v, []).append((u, portadores))
+    if BORDE_A not in grafo or BORDE_B not in grafo:
+        return None
+
+    # Camino de BORDE_A a BORDE_B eligiendo dos portadores libres en cada conexión
+    expansiones = 0
+    pila = [(BORDE_A, frozenset(), frozenset([BORDE_A]))]
+    while pila:
+        nodo, usados, visitados = pila.pop()
+        expansiones += 1
+        if expansiones > MAX_EXPANSIONES:
+            return None
+        for vecino, portadores in grafo.get(nodo, []):
+            if vecino in visitados:
+                continue
+            libres = [c for c in portadores if c not in usados]
+            if len(libres) < 2:
+                continue
+            portador = usados | {libres[0], libres[1]}
+            if vecino == BORDE_B:
+                return set(portador)
+            pila.append((vecino, portador, visitados | {vecino}))
+    return None